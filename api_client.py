@@ -9,7 +9,7 @@ import hashlib
 import json
 import os
 import threading
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from functools import wraps
@@ -28,6 +28,23 @@ os.makedirs(CACHE_DIR, exist_ok=True)
 # 最大缓存条数
 MAX_CACHE_SIZE = 1000
 
+# 确定性模式下重写/润色/续写结果的缓存有效期（秒）
+DETERMINISTIC_CACHE_TTL = 7 * 24 * 3600
+
+
+def _normalize_content(text: str) -> str:
+    """去掉每行首尾空白与空行，保留分行结构"""
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def _normalize_for_key(messages: List[Dict]) -> List[Dict]:
+    """归一化消息内容用于缓存key（缩进、行尾空格、多余空行不影响命中）"""
+    return [
+        {k: _normalize_content(v) if k == "content" and isinstance(v, str) else v
+         for k, v in m.items()}
+        for m in messages
+    ]
+
 
 @dataclass
 class CacheEntry:
@@ -47,14 +64,17 @@ class ResponseCache:
         self.lock = threading.Lock()
         self._load_from_disk()
     
-    def _generate_key(self, messages: List[Dict], model: str) -> str:
-        """生成缓存key"""
-        content = json.dumps(messages, sort_keys=True, ensure_ascii=False) + model
-        return hashlib.md5(content.encode('utf-8')).hexdigest()
+    def _generate_key(self, messages: List[Dict], model: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """生成缓存key（模型、消息与采样参数共同决定）"""
+        content = json.dumps(
+            {"model": model, "messages": _normalize_for_key(messages), "params": params or {}},
+            sort_keys=True, ensure_ascii=False
+        )
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
     
-    def get(self, messages: List[Dict], model: str) -> Optional[str]:
+    def get(self, messages: List[Dict], model: str, params: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """获取缓存"""
-        key = self._generate_key(messages, model)
+        key = self._generate_key(messages, model, params)
         
         with self.lock:
             if key in self.cache:
@@ -68,9 +88,10 @@ class ResponseCache:
         
         return None
     
-    def set(self, messages: List[Dict], model: str, value: str, ttl: int = 3600) -> None:
+    def set(self, messages: List[Dict], model: str, value: str, ttl: int = 3600,
+            params: Optional[Dict[str, Any]] = None) -> None:
         """设置缓存"""
-        key = self._generate_key(messages, model)
+        key = self._generate_key(messages, model, params)
         
         with self.lock:
             # 当缓存满时，删除最老的条目
@@ -225,13 +246,24 @@ class APIClient:
             # 指针前进，下一次调用返回下一个
             self.current_client_index = (idx + 1) % len(self.clients)
             return client
+
+    def _get_rate_limiter(self, limiter_key: str) -> RateLimiter:
+        """获取后端的速率限制器，不存在时在锁内创建（并发调用只会创建一个）"""
+        limiter = self.rate_limiters.get(limiter_key)
+        if limiter is None:
+            with self.lock:
+                limiter = self.rate_limiters.get(limiter_key)
+                if limiter is None:
+                    limiter = self.rate_limiters[limiter_key] = RateLimiter(rate=10, window=60)
+        return limiter
     
     def generate(
         self,
         messages: List[Dict[str, str]],
         use_cache: bool = True,
         max_retries: int = 3,
-        backoff_factor: float = 1.5
+        backoff_factor: float = 1.5,
+        cache_ttl: int = 3600
     ) -> tuple[bool, str]:
         """
         生成文本（带缓存、重试、速率限制）
@@ -241,6 +273,7 @@ class APIClient:
             use_cache: 是否使用缓存
             max_retries: 最大重试次数
             backoff_factor: 退避因子
+            cache_ttl: 缓存有效期（秒）
         
         Returns:
             (成功标志, 生成内容/错误信息)
@@ -256,6 +289,9 @@ class APIClient:
         # 重试逻辑（对不同后端轮询）
         retry_count = 0
         base_wait = 1.0
+
+        # 采样参数（同时参与缓存key，避免不同参数的结果互相命中）
+        sampling = self._sampling_params()
         
         import random
 
@@ -268,28 +304,24 @@ class APIClient:
             model = getattr(backend, "model", None)
             limiter_key = f"{backend.name}_{model}"
 
-            # 确保存在速率限制器
-            if limiter_key not in self.rate_limiters:
-                self.rate_limiters[limiter_key] = RateLimiter(rate=10, window=60)
+            limiter = self._get_rate_limiter(limiter_key)
 
             # 尝试使用缓存（以选中的后端 model 为准）
             if use_cache and model:
-                cached = self.cache.get(messages, model)
+                cached = self.cache.get(messages, model, sampling)
                 if cached:
                     return True, cached
 
             try:
                 # 申请令牌（阻塞直到可用）
-                self.rate_limiters[limiter_key].acquire(blocking=True)
+                limiter.acquire(blocking=True)
 
                 logger.debug(f"调用API: {backend.name} model={model}")
 
                 response = client.chat.completions.create(
                     model=model,
                     messages=messages,
-                    temperature=getattr(self.config.generation, "temperature", 0.8),
-                    top_p=getattr(self.config.generation, "top_p", 1.0),
-                    max_tokens=getattr(self.config.generation, "max_tokens", 512)
+                    **sampling
                 )
 
                 # 增强的响应解析逻辑 - 支持多种格式，过滤状态消息
@@ -402,7 +434,7 @@ class APIClient:
 
                 # 缓存结果 - 只缓存有效内容
                 if use_cache and model and content and len(content) >= 10:
-                    self.cache.set(messages, model, content)
+                    self.cache.set(messages, model, content, ttl=cache_ttl, params=sampling)
                 elif use_cache and model and (not content or len(content) < 10):
                     logger.warning("内容无效，不缓存")
 
@@ -435,6 +467,97 @@ class APIClient:
 
         return False, f"错误：在 {max_retries} 次重试后仍然失败"
     
+    def generate_stream(
+        self,
+        messages: List[Dict[str, str]],
+        max_retries: int = 3,
+        backoff_factor: float = 1.5
+    ) -> Iterator[Tuple[bool, str]]:
+        """
+        流式生成文本（带重试、速率限制，不使用缓存）
+
+        仅在尚未收到任何内容时重试；输出中途出错则直接结束。
+
+        Yields:
+            (True, 增量内容)；失败时产出一次 (False, 错误信息) 后结束
+        """
+        if not self.config.get_enabled_backends():
+            yield False, "错误：无有效后端，请检查设置"
+            return
+
+        if not isinstance(messages, list) or len(messages) == 0:
+            yield False, "错误：messages 必须是非空列表"
+            return
+
+        retry_count = 0
+        base_wait = 1.0
+        sampling = self._sampling_params()
+
+        import random
+
+        while retry_count < max_retries:
+            client_info = self._get_next_client()
+            if not client_info:
+                yield False, "错误：无可用的API客户端"
+                return
+
+            backend, client = client_info
+            model = getattr(backend, "model", None)
+            limiter = self._get_rate_limiter(f"{backend.name}_{model}")
+            started = False
+
+            try:
+                limiter.acquire(blocking=True)
+                logger.debug(f"调用流式API: {backend.name} model={model}")
+
+                stream = client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    stream=True,
+                    **sampling
+                )
+                try:
+                    for chunk in stream:
+                        if not getattr(chunk, "choices", None):
+                            continue
+                        delta = getattr(chunk.choices[0].delta, "content", None)
+                        if delta:
+                            started = True
+                            yield True, delta
+                finally:
+                    # 调用方提前停止迭代时及时关闭连接
+                    close = getattr(stream, "close", None)
+                    if close:
+                        close()
+
+                logger.info(f"流式API调用成功: {backend.name}")
+                return
+
+            except (RateLimitError, APIError) as e:
+                if started:
+                    logger.error(f"流式输出中断 ({backend.name}): {e}")
+                    yield False, f"错误：流式输出中断：{str(e)}"
+                    return
+                retry_count += 1
+                wait_time = base_wait * (backoff_factor ** retry_count) + random.random() * 0.5
+                logger.warning(f"流式API错误 ({backend.name}): {e}，等待 {wait_time:.2f}s 重试... (第{retry_count}次)")
+                time.sleep(wait_time)
+
+            except Exception as e:
+                logger.exception(f"流式调用发生未预期的错误 ({getattr(backend, 'name', 'unknown')}): {e}")
+                yield False, f"错误：{str(e)}"
+                return
+
+        yield False, f"错误：在 {max_retries} 次重试后仍然失败"
+
+    def _sampling_params(self) -> Dict[str, Any]:
+        """当前生成配置中的采样参数"""
+        return {
+            "temperature": getattr(self.config.generation, "temperature", 0.8),
+            "top_p": getattr(self.config.generation, "top_p", 1.0),
+            "max_tokens": getattr(self.config.generation, "max_tokens", 512),
+        }
+
     def test_backends(self) -> Dict[str, bool]:
         """测试所有后端的可用性"""
         results = {}
@@ -10,7 +10,15 @@ import pandas as pd
 import logging
 import threading
 import socket
-from typing import List, Tuple, Optional
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import json
+import hashlib
+import itertools
+from typing import List, Tuple, Optional, Iterator, Dict, Any, Callable, Sequence
+from datetime import datetime
+from pathlib import Path
 import os
 import re
 
@@ -18,9 +26,12 @@ import re
 from config import get_config, Backend
 from logger import setup_logger, get_logger, get_performance_monitor
 from api_client import get_api_client, reinit_api_client
-from file_parser import parse_novel_file, split_by_word_count, split_by_pattern
+from file_parser import (
+    parse_novel_file, split_by_word_count, split_by_pattern, pack_segments, iter_split_by_word_count,
+    PARSER_VERSION
+)
 from novel_generator import (
-    get_generator, OutlineParser, PRESET_TEMPLATES,
+    get_generator, OutlineParser, PRESET_TEMPLATES, NovelProject, Chapter, STREAMING_STATUS,
     save_generation_cache, load_generation_cache, clear_generation_cache,
     list_generation_caches, get_cache_size,
     generate_chapter_summary, save_chapter_summary, load_chapter_summaries,
@@ -28,9 +39,32 @@ from novel_generator import (
     get_summary_cache_size
 )
 from exporter import export_to_docx, export_to_txt, export_to_markdown, export_to_html, list_export_files
-from project_manager import ProjectManager
+from project_manager import ProjectManager, PROJECTS_DIR, CHAPTER_LOG_FILE
 from config_api import config_api
 
+# 导出格式 -> (扩展名, 导出函数)
+_EXPORT_FORMATS = {
+    "Word (.docx)": ("docx", export_to_docx),
+    "文本 (.txt)": ("txt", export_to_txt),
+    "Markdown (.md)": ("md", export_to_markdown),
+    "HTML (.html)": ("html", export_to_html),
+}
+
+# 项目/缓存列表每页显示的条数
+LIST_PAGE_SIZE = 50
+
+# 项目列表缓存的最长有效期（秒），兜底外部直接修改项目文件的情况
+PROJECT_LIST_TTL = 30
+
+# 标题输入停顿多久后再检查缓存（秒）
+TITLE_CHECK_DEBOUNCE = 0.3
+
+# 上传文件解析结果缓存目录（按文件内容哈希+分段参数+解析器版本缓存）
+PARSE_CACHE_DIR = Path("cache/parse")
+# 解析缓存最多保留的条目数和总字节数，超出任一限制时删除最久未使用的
+PARSE_CACHE_MAX_ENTRIES = 100
+PARSE_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
 # 设置日志
 logger = setup_logger("NovelToolUI", log_level=logging.INFO)
 config = get_config()
@@ -41,6 +75,10 @@ WEB_PORT = int(os.getenv("NOVEL_TOOL_PORT", os.getenv("PORT", "7860")))
 WEB_SHOW_ERRORS = os.getenv("NOVEL_TOOL_SHOW_ERRORS", "false").lower() in ("1", "true", "yes")
 WEB_CONCURRENCY = int(os.getenv("NOVEL_TOOL_CONCURRENCY", "4"))
 WEB_QUEUE_MAX = int(os.getenv("NOVEL_TOOL_QUEUE_MAX", "50"))
+# 分段重写/润色时同时进行的API请求数
+SEGMENT_CONCURRENCY = max(1, int(os.getenv("NOVEL_TOOL_SEGMENT_CONCURRENCY", "4")))
+# 重写模式自动分段时将相邻短段落合并为不超过该字数的块（约3000 tokens），0 表示不合并
+REWRITE_PACK_CHARS = max(0, int(os.getenv("NOVEL_TOOL_REWRITE_PACK_CHARS", "2000")))
 
 
 def find_available_port(start_port: int = 7860, max_attempts: int = 100) -> int:
@@ -56,10 +94,11 @@ def find_available_port(start_port: int = 7860, max_attempts: int = 100) -> int:
     return start_port
 
 # 全局状态管理
+# 生成中/停止请求使用 threading.Event，读取无需加锁
+_GENERATING = threading.Event()
+_STOP_EVENT = threading.Event()
+
 generation_state = {
-    "is_generating": False,
-    "stop_requested": False,
-    "lock": threading.Lock(),
     "current_project": None,  # 存储当前生成中的项目对象
     "current_chapters": None,  # 存储当前生成中的章节列表
     "current_full_text": None  # 存储当前生成的完整文本
@@ -68,9 +107,15 @@ generation_state = {
 
 def set_generation_state(is_generating: bool, stop_requested: bool = False) -> None:
     """线程安全地更新生成状态"""
-    with generation_state["lock"]:
-        generation_state["is_generating"] = is_generating
-        generation_state["stop_requested"] = stop_requested
+    if stop_requested:
+        _STOP_EVENT.set()
+    else:
+        _STOP_EVENT.clear()
+
+    if is_generating:
+        _GENERATING.set()
+    else:
+        _GENERATING.clear()
 
 
 def request_stop() -> Tuple[str, gr.update]:
@@ -82,8 +127,36 @@ def request_stop() -> Tuple[str, gr.update]:
 
 def should_stop() -> bool:
     """检查是否应该停止"""
-    with generation_state["lock"]:
-        return generation_state["stop_requested"]
+    return _STOP_EVENT.is_set()
+
+
+def iter_segments_concurrently(
+    func: Callable[[Any], Any],
+    items: Sequence[Any],
+    start: int = 0,
+    stop: Optional[Callable[[], bool]] = None,
+    max_workers: int = SEGMENT_CONCURRENCY
+) -> Iterator[Tuple[int, Any]]:
+    """
+    并发处理各段并按原顺序产出 (索引, 结果)
+
+    后台最多同时运行 max_workers 个任务；stop() 返回 True 后不再提交新任务。
+    调用方提前结束迭代时，尚未开始的任务会被取消。
+    """
+    pool = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+    next_idx = start
+    try:
+        while True:
+            while next_idx < len(items) and len(pending) < max_workers and not (stop and stop()):
+                pending.append((next_idx, pool.submit(func, items[next_idx])))
+                next_idx += 1
+            if not pending:
+                return
+            idx, future = pending.popleft()
+            yield idx, future.result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
 
 # ==================== 润色功能 ====================
@@ -96,7 +169,6 @@ def handle_polish(text: str, polish_type: str, custom_req: str, progress=gr.Prog
     generator = get_generator()
 
     # 生成项目名称
-    from datetime import datetime
     project_title = f"润色-{polish_type}-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
     try:
@@ -147,20 +219,20 @@ def handle_polish(text: str, polish_type: str, custom_req: str, progress=gr.Prog
         else:
             # 文本较长，自动分段处理
             logger.info(f"文本过长（{len(text)}字），启用自动分段处理")
-            from file_parser import split_by_word_count
             segments = split_by_word_count(text, max_single_segment)
             logger.info(f"已分为 {len(segments)} 段，开始逐段润色")
 
-            polished_segments = []
-            for i, segment in enumerate(segments):
-                progress((i + 1) / len(segments), desc=f"润色第 {i+1}/{len(segments)} 段")
-
-                segment_content, success_msg = generator.polish_text(
+            def polish_segment(segment):
+                return generator.polish_text(
                     text=segment,
                     polish_type=actual_type,
                     custom_requirements=custom_req
                 )
 
+            polished_segments = []
+            for i, (segment_content, success_msg) in iter_segments_concurrently(polish_segment, segments):
+                progress((i + 1) / len(segments), desc=f"润色第 {i+1}/{len(segments)} 段")
+
                 if success_msg != "润色成功":
                     logger.error(f"第 {i+1} 段润色失败: {segment_content}")
                     return "", f"第 {i+1} 段润色失败: {segment_content}"
@@ -179,7 +251,6 @@ def handle_polish(text: str, polish_type: str, custom_req: str, progress=gr.Prog
 
         # 保存到项目管理
         if polished_content:
-            from novel_generator import NovelProject, Chapter
             project = NovelProject(
                 title=project_title,
                 genre="润色",
@@ -222,7 +293,6 @@ def handle_polish_with_suggestions(text: str, custom_req: str, progress=gr.Progr
     generator = get_generator()
 
     # 生成项目名称
-    from datetime import datetime
     project_title = f"润色-改进建议-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
     try:
@@ -260,7 +330,6 @@ def handle_polish_with_suggestions(text: str, custom_req: str, progress=gr.Progr
         else:
             # 文本较长，自动分段处理
             logger.info(f"文本过长（{len(text)}字），启用自动分段处理")
-            from file_parser import split_by_word_count
             segments = split_by_word_count(text, max_single_segment)
             logger.info(f"已分为 {len(segments)} 段，开始逐段润色")
 
@@ -296,7 +365,6 @@ def handle_polish_with_suggestions(text: str, custom_req: str, progress=gr.Progr
 
         # 保存到项目管理
         if polished_content:
-            from novel_generator import NovelProject, Chapter
             project = NovelProject(
                 title=project_title,
                 genre="润色",
@@ -346,30 +414,37 @@ def handle_rewrite(paragraphs: List[str], rewritten_parts: List[str], style_name
     style_template = PRESET_TEMPLATES.get(style_name, PRESET_TEMPLATES["重写风格 - 默认"])
     
     # 生成项目名称
-    from datetime import datetime
     project_title = f"重写-{style_name}-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
     try:
-        for i in range(start_idx, total):
+        # 各段请求并发发出，结果仍按顺序写入 rewritten_parts，以便暂停后从断点继续
+        results = iter_segments_concurrently(
+            lambda paragraph: generator.rewrite_paragraph(paragraph, style_template),
+            paragraphs,
+            start=start_idx,
+            stop=should_stop
+        )
+        for i, (content, success_msg) in results:
             if should_stop():
                 logger.info(f"重写已暂停，已完成 {len(rewritten_parts)}/{total} 段")
-                yield "\n\n".join(rewritten_parts), "\n\n".join(rewritten_parts), rewritten_parts[:], f"已暂停 - 完成 {len(rewritten_parts)}/{total} 段"
+                done = "\n\n".join(rewritten_parts)
+                yield done, done, rewritten_parts[:], f"已暂停 - 完成 {len(rewritten_parts)}/{total} 段"
                 return
 
             progress((i + 1 - start_idx) / (total - start_idx), desc=f"重写第 {i+1}/{total} 段")
 
-            content, success_msg = generator.rewrite_paragraph(paragraphs[i], style_template)
-
             if success_msg != "重写成功":
                 logger.error(f"第 {i+1} 段重写失败: {success_msg}")
-                yield "\n\n".join(rewritten_parts), "\n\n".join(rewritten_parts), rewritten_parts[:], success_msg
+                done = "\n\n".join(rewritten_parts)
+                yield done, done, rewritten_parts[:], success_msg
                 return
 
             # 验证content是否有效：检查是否为状态消息或过短
             if not content or not content.strip() or len(content.strip()) < 10:
                 error_msg = f"第 {i+1} 段重写返回了无效内容（长度: {len(content) if content else 0}字）"
                 logger.error(error_msg)
-                yield "\n\n".join(rewritten_parts), "\n\n".join(rewritten_parts), rewritten_parts[:], error_msg
+                done = "\n\n".join(rewritten_parts)
+                yield done, done, rewritten_parts[:], error_msg
                 return
 
             # 检查是否为状态消息（如"重写成功"、"润色成功"等）
@@ -379,7 +454,8 @@ def handle_rewrite(paragraphs: List[str], rewritten_parts: List[str], style_name
                 if status_msg in content_stripped and len(content_stripped) < 50:
                     error_msg = f"第 {i+1} 段重写返回了状态消息而非实际内容: '{content_stripped}'"
                     logger.error(error_msg)
-                    yield "\n\n".join(rewritten_parts), "\n\n".join(rewritten_parts), rewritten_parts[:], error_msg
+                    done = "\n\n".join(rewritten_parts)
+                    yield done, done, rewritten_parts[:], error_msg
                     return
 
             rewritten_parts.append(content)
@@ -387,11 +463,17 @@ def handle_rewrite(paragraphs: List[str], rewritten_parts: List[str], style_name
             stats = f"进度 {len(rewritten_parts)}/{total} | 约 {sum(len(p) for p in rewritten_parts)} 字"
             yield full, full, rewritten_parts[:], stats
 
+        if len(rewritten_parts) < total:
+            # 停止请求后不再提交新段落，已发出的请求处理完即结束
+            logger.info(f"重写已暂停，已完成 {len(rewritten_parts)}/{total} 段")
+            done = "\n\n".join(rewritten_parts)
+            yield done, done, rewritten_parts[:], f"已暂停 - 完成 {len(rewritten_parts)}/{total} 段"
+            return
+
         logger.info("重写完成")
         
         # 保存到项目管理
         if full:
-            from novel_generator import NovelProject, Chapter
             project = NovelProject(
                 title=project_title,
                 genre="重写",
@@ -448,11 +530,12 @@ def handle_continue_writing(
     generator = get_generator()
     
     # 生成项目名称
-    from datetime import datetime
     project_title = f"续写-{title}-{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
     try:
-        content, success_msg = generator.continue_writing(
+        # 流式输出：生成过程中实时显示已生成的内容
+        content, success_msg = "", ""
+        stream = generator.continue_writing_stream(
             existing_text=existing_text,
             novel_title=title,
             character_setting=char_setting,
@@ -460,6 +543,15 @@ def handle_continue_writing(
             plot_idea=plot_idea,
             target_words=int(target_words) if target_words else 2500
         )
+        for content, success_msg in stream:
+            if success_msg != STREAMING_STATUS:
+                break
+            if should_stop():
+                stream.close()
+                logger.info(f"续写已停止，已生成 {len(content)} 字")
+                yield content, f"已停止 - 已生成 {len(content)} 字"
+                return
+            yield content, f"续写中... 已生成 {len(content)} 字"
 
         if success_msg == "续写成功":
             # 验证content是否有效：检查是否为状态消息或过短
@@ -483,7 +575,6 @@ def handle_continue_writing(
 
             # 保存到项目管理
             if content:
-                from novel_generator import NovelProject, Chapter
                 project = NovelProject(
                     title=project_title,
                     genre="续写",
@@ -521,7 +612,144 @@ def handle_continue_writing(
 
 
 # ==================== 文件解析（支持多种分段方式） ====================
+def update_split_ui(split_method: str):
+    """根据分段方式切换字数/分段标记输入区的可见性"""
+    return (
+        gr.update(visible=split_method == "按字数分段"),
+        gr.update(visible=split_method == "按固定文本分段"),
+    )
+
+
+def _file_sha256(file_path: str) -> str:
+    """分块计算文件内容的sha256"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _parse_cache_file(file_path, split_method, word_count, pattern, keep_marker) -> Optional[Path]:
+    """根据文件内容与分段参数确定缓存文件路径，无法计算时返回None"""
+    path = getattr(file_path, 'name', file_path)
+    if not isinstance(path, str) or not os.path.isfile(path):
+        return None
+    try:
+        content_hash = _file_sha256(path)
+    except OSError as e:
+        logger.debug(f"计算文件哈希失败: {e}")
+        return None
+
+    # 只有所选分段方式用到的参数才参与缓存键，并统一类型（2000 与 2000.0 命中同一条缓存）
+    if split_method == "按字数分段":
+        try:
+            method_params = [int(word_count)]
+        except (TypeError, ValueError):
+            return None
+    elif split_method == "按固定文本分段":
+        method_params = [(pattern or "").strip(), bool(keep_marker)]
+    else:
+        method_params = []
+
+    params = json.dumps(
+        [PARSER_VERSION, Path(path).suffix.lower(), split_method, *method_params],
+        ensure_ascii=False
+    )
+    params_hash = hashlib.sha256(params.encode('utf-8')).hexdigest()[:16]
+    return PARSE_CACHE_DIR / f"{content_hash}__{params_hash}.json"
+
+
+def _parse_cache_entries() -> List[os.DirEntry]:
+    """解析缓存文件列表，目录不存在时返回空列表"""
+    try:
+        with os.scandir(PARSE_CACHE_DIR) as it:
+            return [entry for entry in it if entry.is_file() and entry.name.endswith('.json')]
+    except FileNotFoundError:
+        return []
+
+
+def _prune_parse_cache(max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+    """
+    解析缓存超过 max_entries 条或 max_bytes 字节（默认 PARSE_CACHE_MAX_ENTRIES/PARSE_CACHE_MAX_BYTES）时
+    删除最久未使用的条目（最近使用的一条总是保留）
+    """
+    if max_entries is None:
+        max_entries = PARSE_CACHE_MAX_ENTRIES
+    if max_bytes is None:
+        max_bytes = PARSE_CACHE_MAX_BYTES
+
+    entries = sorted(_parse_cache_entries(), key=lambda entry: entry.stat().st_mtime, reverse=True)
+    total_bytes = 0
+    for kept, entry in enumerate(entries):
+        total_bytes += entry.stat().st_size
+        if kept and (kept >= max_entries or total_bytes > max_bytes):
+            break
+    else:
+        return
+
+    for entry in entries[kept:]:
+        try:
+            os.remove(entry.path)
+        except OSError as e:
+            logger.debug(f"删除解析缓存失败 {entry.name}: {e}")
+
+
+def clear_parse_cache() -> int:
+    """清空文件解析缓存，返回删除的条目数"""
+    removed = 0
+    for entry in _parse_cache_entries():
+        try:
+            os.remove(entry.path)
+            removed += 1
+        except OSError as e:
+            logger.debug(f"删除解析缓存失败 {entry.name}: {e}")
+    return removed
+
+
+def get_parse_cache_size() -> int:
+    """文件解析缓存占用的字节数"""
+    return sum(entry.stat().st_size for entry in _parse_cache_entries())
+
+
 def parse_novel_file_with_split(file_path, split_method="自动分段", word_count=2000, pattern="", keep_marker=True):
+    """
+    解析小说文件（相同文件与分段参数直接返回缓存的结果）
+
+    Returns:
+        (段落列表, 状态信息)
+    """
+    if not file_path:
+        return [], "无文件"
+
+    cache_file = _parse_cache_file(file_path, split_method, word_count, pattern, keep_marker)
+    if cache_file is not None and cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            # 更新修改时间，淘汰时按最近使用保留
+            os.utime(cache_file, None)
+            logger.info(f"使用解析缓存: {cache_file.name}")
+            return cached["segments"], cached["status"]
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"读取解析缓存失败: {e}")
+
+    segments, status = _parse_novel_file_with_split(file_path, split_method, word_count, pattern, keep_marker)
+
+    if cache_file is not None and segments:
+        try:
+            PARSE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({"segments": segments, "status": status}, f, ensure_ascii=False)
+            os.replace(tmp_file, cache_file)
+            _prune_parse_cache()
+        except OSError as e:
+            logger.warning(f"保存解析缓存失败: {e}")
+
+    return segments, status
+
+
+def _parse_novel_file_with_split(file_path, split_method="自动分段", word_count=2000, pattern="", keep_marker=True):
     """
     解析小说文件，支持多种分段方式
 
@@ -544,26 +772,28 @@ def parse_novel_file_with_split(file_path, split_method="自动分段", word_cou
     if not paragraphs:
         return paragraphs, status
 
-    # 合并所有段落为完整文本
-    full_text = "\n\n".join(paragraphs)
-
     # 根据分段方式进行处理
     if split_method == "自动分段":
         # 自动分段：直接使用原始段落
         return paragraphs, status
     elif split_method == "按字数分段":
-        # 按字数分段
+        # 按字数分段：逐段拼接切分，不构建完整文本的副本
         try:
-            segments = split_by_word_count(full_text, word_count)
+            word_count = int(word_count)
+            pieces = itertools.chain.from_iterable(
+                (("\n\n", p) if i else (p,)) for i, p in enumerate(paragraphs)
+            )
+            segments = list(iter_split_by_word_count(pieces, word_count))
             return segments, f"按字数分段完成，共 {len(segments)} 段，每段约 {word_count} 字"
         except ValueError as e:
             return [], f"分段失败: {str(e)}"
     elif split_method == "按固定文本分段":
-        # 按固定文本分段
+        # 按固定文本分段（正则可能跨段匹配，需要完整文本）
         if not pattern or not pattern.strip():
             return [], "请输入分段标记"
 
         try:
+            full_text = "\n\n".join(paragraphs)
             segments = split_by_pattern(full_text, pattern.strip(), keep_marker)
             return segments, f"按固定文本分段完成，共 {len(segments)} 段"
         except ValueError as e:
@@ -572,6 +802,34 @@ def parse_novel_file_with_split(file_path, split_method="自动分段", word_cou
         return paragraphs, status
 
 
+def parse_novel_file_for_rewrite(file_path, split_method="自动分段", word_count=2000, pattern="", keep_marker=True):
+    """
+    解析重写模式的文件：自动分段时合并相邻短段落以减少请求次数，
+    用户指定的按字数/按固定文本分段保持原样
+
+    Returns:
+        (段落列表, 状态信息)
+    """
+    segments, status = parse_novel_file_with_split(file_path, split_method, word_count, pattern, keep_marker)
+    if segments and split_method == "自动分段" and REWRITE_PACK_CHARS:
+        packed = pack_segments(segments, REWRITE_PACK_CHARS)
+        if len(packed) < len(segments):
+            status = f"{status}，合并为 {len(packed)} 个重写块（每块不超过 {REWRITE_PACK_CHARS} 字）"
+        segments = packed
+    return segments, status
+
+
+def parse_novel_file_with_text(file_path, split_method="自动分段", word_count=2000, pattern="", keep_marker=True):
+    """
+    解析并分段小说文件，只返回拼接后的全文（续写/润色模式直接填充输入框，不保留段落列表）
+
+    Returns:
+        (状态信息, 全文)
+    """
+    segments, status = parse_novel_file_with_split(file_path, split_method, word_count, pattern, keep_marker)
+    return status, "\n\n".join(segments) if segments else ""
+
+
 # ==================== 大纲生成 ====================
 def handle_generate_outline(title: str, genre: str, total_chapters: int, char_setting: str, world_setting: str, plot_idea: str) -> Tuple[str, str]:
     """生成大纲"""
@@ -589,6 +847,37 @@ def handle_generate_outline(title: str, genre: str, total_chapters: int, char_se
 
 
 # ==================== 小说生成 ====================
+def _build_generation_cache(project_id: str, title: str, completed: int, total_chapters: int,
+                            chapters: list, status: str, genre: str, char_setting: str,
+                            world_setting: str, plot_idea: str) -> dict:
+    """构建生成缓存快照"""
+    return {
+        "project_id": project_id,
+        "title": title,
+        "current_chapter": completed,
+        "total_chapters": total_chapters,
+        "generated_content": {str(ch.num): ch.to_dict() for ch in chapters},
+        "generation_status": status,
+        "timestamp": datetime.now().isoformat(),
+        "config": {
+            "genre": genre,
+            "character_setting": char_setting,
+            "world_setting": world_setting,
+            "plot_idea": plot_idea
+        }
+    }
+
+
+def _tail_lines(parts: List[str], n: int) -> str:
+    """取分块文本拼接后的最后n行（只拼接末尾足够的块）"""
+    tail = ""
+    for part in reversed(parts):
+        tail = part + tail
+        if tail.count('\n') >= n:
+            break
+    return '\n'.join(tail.split('\n')[-n:])
+
+
 def handle_generate_novel(current_text: str, outline_text: str, title: str, genre: str, char_setting: str, world_setting: str, plot_idea: str, enable_context: bool = False, context_mode: str = "摘要模式", context_chapters: int = 3, context_max_length: int = 1000, progress=gr.Progress()):
     """生成小说（支持续写、暂停、自动保存、字数为0重试、缓存管理、上下文增强）"""
     if not outline_text or not outline_text.strip():
@@ -611,15 +900,15 @@ def handle_generate_novel(current_text: str, outline_text: str, title: str, genr
 
     # 检查已完成的章节（支持断点续传）
     completed = 0
-    import re as regex
-    chapter_matches = regex.findall(r'## 第(\d+)章', current_text)
+    chapter_matches = re.findall(r'## 第(\d+)章', current_text)
     if chapter_matches:
         completed = max(int(x) for x in chapter_matches)
 
-    # 确保标题存在
+    # 确保标题存在；正文按块累积在列表中，仅在输出时拼接一次
     full_text = current_text.strip()
     if not full_text.startswith(f"# {title}"):
         full_text = f"# {title}\n\n" + full_text
+    text_parts = [full_text]
 
     # 创建或更新项目（在生成过程中就能看到）
     project_result = None
@@ -629,7 +918,6 @@ def handle_generate_novel(current_text: str, outline_text: str, title: str, genr
         # 尝试获取现有项目或创建新项目
         existing_project = ProjectManager.get_project_by_title(title)
         if existing_project:
-            from novel_generator import NovelProject
             project_result = NovelProject(
                 title=title,
                 genre=genre,
@@ -642,7 +930,6 @@ def handle_generate_novel(current_text: str, outline_text: str, title: str, genr
             # 加载已有的章节数据
             for i in range(len(chapters)):
                 if i < len(existing_project.get('chapters', [])):
-                    from novel_generator import Chapter
                     ch_data = existing_project['chapters'][i]
                     chapters[i].content = ch_data.get('content', '')
                     chapters[i].word_count = ch_data.get('word_count', 0)
@@ -674,6 +961,16 @@ def handle_generate_novel(current_text: str, outline_text: str, title: str, genr
                         ch.generated_at = cached_chapters[str(ch.num)].get('generated_at', '')
                         logger.info(f"从缓存恢复章节 {ch.num}: {ch.word_count} 字")
 
+            # 从章节追加日志恢复（上次生成意外中断、尚未完整保存的章节）
+            logged_chapters = ProjectManager.load_chapter_log(project_id)
+            for ch in chapters:
+                logged = logged_chapters.get(ch.num)
+                if logged and logged.get('content', '').strip():
+                    ch.content = logged['content']
+                    ch.word_count = logged.get('word_count', 0)
+                    ch.generated_at = logged.get('generated_at', '')
+                    logger.info(f"从章节日志恢复章节 {ch.num}: {ch.word_count} 字")
+
         retry_count = 0
         max_retries = 3  # 最大重试次数
 
@@ -686,23 +983,12 @@ def handle_generate_novel(current_text: str, outline_text: str, title: str, genr
                     ProjectManager.save_project(project_result)
                 # 保存缓存
                 if project_id:
-                    cache_data = {
-                        "project_id": project_id,
-                        "title": title,
-                        "current_chapter": completed,
-                        "total_chapters": total_chapters,
-                        "generated_content": {str(ch.num): ch.to_dict() for ch in chapters},
-                        "generation_status": "stopped",
-                        "timestamp": datetime.now().isoformat(),
-                        "config": {
-                            "genre": genre,
-                            "character_setting": char_setting,
-                            "world_setting": world_setting,
-                            "plot_idea": plot_idea
-                        }
-                    }
+                    cache_data = _build_generation_cache(
+                        project_id, title, completed, total_chapters, chapters, "stopped",
+                        genre, char_setting, world_setting, plot_idea
+                    )
                     save_generation_cache(project_id, cache_data)
-                yield full_text, f"已暂停 - 已完成 {completed}/{total_chapters} 章，项目已保存"
+                yield "".join(text_parts), f"已暂停 - 已完成 {completed}/{total_chapters} 章，项目已保存"
                 return
 
             chapter = chapters[i - 1]
@@ -711,17 +997,13 @@ def handle_generate_novel(current_text: str, outline_text: str, title: str, genr
             # 如果章节已生成（从缓存），跳过
             if chapter.content and chapter.content.strip():
                 logger.info(f"章节 {i} 已存在，跳过生成")
-                chapter_block = f"## 第{i}章: {chapter.title}\n\n{chapter.content}\n\n"
-                full_text += chapter_block
+                text_parts.append(f"## 第{i}章: {chapter.title}\n\n{chapter.content}\n\n")
                 completed = i
-                yield full_text, f"已完成 {i}/{total_chapters} 章（从缓存恢复）"
+                yield "".join(text_parts), f"已完成 {i}/{total_chapters} 章（从缓存恢复）"
                 continue
 
             # 获取前文以保证连贯性
-            previous_content = ""
-            if full_text:
-                lines = full_text.split('\n')
-                previous_content = '\n'.join(lines[-50:])  # 最后50行
+            previous_content = _tail_lines(text_parts, 50)  # 最后50行
 
             # 构建上下文（如果启用上下文增强）
             context_summary = ""
@@ -781,34 +1063,22 @@ def handle_generate_novel(current_text: str, outline_text: str, title: str, genr
                     logger.error(f"第 {i} 章生成失败，已达最大重试次数")
                     # 保存缓存以便重试
                     if project_id:
-                        cache_data = {
-                            "project_id": project_id,
-                            "title": title,
-                            "current_chapter": completed,
-                            "total_chapters": total_chapters,
-                            "generated_content": {str(ch.num): ch.to_dict() for ch in chapters},
-                            "generation_status": "stopped",
-                            "timestamp": datetime.now().isoformat(),
-                            "config": {
-                                "genre": genre,
-                                "character_setting": char_setting,
-                                "world_setting": world_setting,
-                                "plot_idea": plot_idea
-                            }
-                        }
+                        cache_data = _build_generation_cache(
+                            project_id, title, completed, total_chapters, chapters, "stopped",
+                            genre, char_setting, world_setting, plot_idea
+                        )
                         save_generation_cache(project_id, cache_data)
-                    yield full_text, f"生成失败：第 {i} 章生成失败（已重试{max_retries}次）"
+                    yield "".join(text_parts), f"生成失败：第 {i} 章生成失败（已重试{max_retries}次）"
                     return
 
             if not success_msg or success_msg != "生成成功":
                 logger.error(f"第 {i} 章生成失败: {success_msg}")
-                yield full_text, f"生成失败：{success_msg}"
+                yield "".join(text_parts), f"生成失败：{success_msg}"
                 return
 
             # 保存章节内容
             chapter.content = content
             chapter.word_count = len(content)
-            from datetime import datetime
             chapter.generated_at = datetime.now().isoformat()
             logger.info(f"章节 {i} 内容已保存: {len(content)} 字")
 
@@ -824,39 +1094,26 @@ def handle_generate_novel(current_text: str, outline_text: str, title: str, genr
                 else:
                     logger.warning(f"章节 {i} 摘要生成失败: {summary_msg}")
 
-            chapter_block = f"## 第{i}章: {chapter.title}\n\n{content}\n\n"
-            full_text += chapter_block
+            text_parts.append(f"## 第{i}章: {chapter.title}\n\n{content}\n\n")
             completed = i
 
-            # 每生成完一章就自动保存项目（支持断点续传）
-            if project_result and i % 1 == 0:  # 每章都保存
-                project_result.chapters = chapters
-                project_result.updated_at = datetime.now().isoformat()
-                save_success, save_msg = ProjectManager.save_project(project_result)
+            # 每生成完一章就自动保存（支持断点续传）：项目首次保存时写入完整元数据，
+            # 之后只向章节日志追加本章，暂停/失败/完成时再完整保存
+            if project_result:
+                if project_result.id:
+                    save_success, save_msg = ProjectManager.append_chapter(project_result.id, chapter)
+                else:
+                    project_result.chapters = chapters
+                    project_result.updated_at = datetime.now().isoformat()
+                    save_success, save_msg = ProjectManager.save_project(project_result)
+                    project_id = project_result.id
                 if save_success:
                     logger.info(f"项目进度已保存: {project_result.id}")
 
-                # 保存缓存
-                cache_data = {
-                    "project_id": project_id,
-                    "title": title,
-                    "current_chapter": completed,
-                    "total_chapters": total_chapters,
-                    "generated_content": {str(ch.num): ch.to_dict() for ch in chapters},
-                    "generation_status": "generating",
-                    "timestamp": datetime.now().isoformat(),
-                    "config": {
-                        "genre": genre,
-                        "character_setting": char_setting,
-                        "world_setting": world_setting,
-                        "plot_idea": plot_idea
-                    }
-                }
-                save_generation_cache(project_id, cache_data)
-
-            yield full_text, f"已完成 {i}/{total_chapters} 章"
+            yield "".join(text_parts), f"已完成 {i}/{total_chapters} 章"
 
         logger.info(f"小说生成完成: {title}")
+        full_text = "".join(text_parts)
 
         # 最终保存项目
         if project_result:
@@ -892,17 +1149,10 @@ def handle_export_current_progress(current_text: str, title: str, export_format:
 
     try:
         # 确定导出格式
-        format_map = {
-            "Word (.docx)": ("docx", export_to_docx),
-            "文本 (.txt)": ("txt", export_to_txt),
-            "Markdown (.md)": ("md", export_to_markdown),
-            "HTML (.html)": ("html", export_to_html),
-        }
-
-        if export_format not in format_map:
+        if export_format not in _EXPORT_FORMATS:
             return None, f"❌ 不支持的导出格式: {export_format}"
 
-        file_ext, export_func = format_map[export_format]
+        file_ext, export_func = _EXPORT_FORMATS[export_format]
 
         # 调用对应的导出函数
         success, result = export_func(current_text, title)
@@ -919,14 +1169,40 @@ def handle_export_current_progress(current_text: str, title: str, export_format:
         return None, f"❌ 导出出错: {str(e)}"
 
 
+def _chapter_log_cache_info(project: Dict) -> Optional[Dict]:
+    """
+    从章节追加日志获取中断生成的进度（生成过程中只追加章节日志，进程被终止时没有生成缓存）
+
+    Returns:
+        与 list_generation_caches 条目结构相同的字典；日志中没有已完成章节时返回 None
+    """
+    logged = [r for r in ProjectManager.load_chapter_log(project["id"]).values() if r.get("content", "").strip()]
+    if not logged:
+        return None
+
+    try:
+        size = os.path.getsize(os.path.join(PROJECTS_DIR, project["id"], CHAPTER_LOG_FILE))
+    except OSError:
+        size = 0
+    return {
+        "project_id": project["id"],
+        "title": project.get("title", "未知"),
+        "current_chapter": max(int(r.get("num", 0)) for r in logged),
+        "total_chapters": project.get("chapter_count", 0),
+        "status": "interrupted",
+        "timestamp": max(r.get("generated_at", "") for r in logged),
+        "size": size
+    }
+
+
 def check_cache_status(title: str) -> Tuple[str, str, bool]:
     """检查缓存状态"""
     if not title or not title.strip():
         return "无缓存", "", False
 
     try:
-        # 获取项目
-        existing_project = ProjectManager.get_project_by_title(title)
+        # 获取项目（使用项目列表缓存，避免每次都读取全部项目元数据）
+        existing_project = next((p for p in _get_cached_projects() if p.get("title") == title), None)
         if not existing_project:
             return "无缓存", "", False
 
@@ -935,7 +1211,13 @@ def check_cache_status(title: str) -> Tuple[str, str, bool]:
         # 检查缓存
         cache_data, cache_msg = load_generation_cache(project_id)
         if not cache_data:
-            return "无缓存", "", False
+            # 没有生成缓存时检查章节日志（生成中途被终止的项目）
+            log_info = _chapter_log_cache_info(existing_project)
+            if not log_info:
+                return "无缓存", "", False
+            timestamp = log_info["timestamp"]
+            cache_info = f"发现未完成的生成：已完成 {log_info['current_chapter']}/{log_info['total_chapters']} 章"
+            return cache_info, f"最后保存时间: {timestamp[:19] if timestamp else '未知'}", True
 
         # 返回缓存信息
         current_chapter = cache_data.get('current_chapter', 0)
@@ -953,25 +1235,72 @@ def check_cache_status(title: str) -> Tuple[str, str, bool]:
         return "检查失败", "", False
 
 
-def handle_list_caches() -> Tuple[pd.DataFrame, str]:
-    """列出所有缓存"""
+def debounced_check_cache_status(title: str) -> Tuple[str, str]:
+    """
+    标题输入时的缓存检查（配合 trigger_mode="always_last" 使用）
+
+    先等待一小段时间，期间的后续按键只会保留最后一次触发，
+    连续输入时只会检查一到两次而不是每个字符都查一次。
+    """
+    time.sleep(TITLE_CHECK_DEBOUNCE)
+    cache_info, timestamp_info, _ = check_cache_status(title)
+    return cache_info, timestamp_info
+
+
+def _page_message(noun: str, total: int, offset: int, shown: int) -> str:
+    """生成分页列表的状态信息"""
+    if shown >= total and offset == 0:
+        return f"找到 {total} 个{noun}"
+    if shown == 0:
+        return f"找到 {total} 个{noun}，当前页码超出范围"
+    return f"找到 {total} 个{noun}，显示第 {offset + 1}-{offset + shown} 个"
+
+
+def _page_slice(items: list, page, limit: int) -> Tuple[list, int]:
+    """取第 page 页（从1开始）的条目，返回 (本页条目, 偏移量)"""
+    try:
+        page = max(int(page or 1), 1)
+    except (TypeError, ValueError):
+        page = 1
+    offset = (page - 1) * limit
+    return items[offset:offset + limit], offset
+
+
+# 表格列定义（按位置构建行，避免逐行字典的列推断）
+CACHE_TABLE_COLUMNS = ["项目名", "当前章节", "总章节", "状态", "缓存时间", "大小(KB)"]
+SUMMARY_CACHE_TABLE_COLUMNS = ["项目ID", "章节数", "总大小(KB)"]
+PROJECT_TABLE_COLUMNS = ["项目名", "类型", "创建时间", "更新时间", "章节数", "完成度"]
+BACKEND_TABLE_COLUMNS = ["名称", "类型", "Base URL", "模型", "启用", "超时(秒)", "重试次数"]
+
+
+def handle_list_caches(page: int = 1, limit: int = LIST_PAGE_SIZE) -> Tuple[pd.DataFrame, str]:
+    """列出缓存（按页，page 从1开始；包括只有章节日志的中断生成）"""
     try:
         caches = list_generation_caches()
+        cached_ids = {c["project_id"] for c in caches}
+        for project in _get_cached_projects():
+            if project["id"] not in cached_ids:
+                log_info = _chapter_log_cache_info(project)
+                if log_info:
+                    caches.append(log_info)
         if not caches:
-            return pd.DataFrame(columns=["项目名", "当前章节", "总章节", "状态", "缓存时间", "大小(KB)"]), "暂无缓存"
-
-        df = pd.DataFrame([
-            {
-                "项目名": c["title"],
-                "当前章节": c["current_chapter"],
-                "总章节": c["total_chapters"],
-                "状态": c["status"],
-                "缓存时间": c["timestamp"][:19] if c["timestamp"] else "",
-                "大小(KB)": round(c["size"] / 1024, 2)
-            }
-            for c in caches
-        ])
-        return df, f"找到 {len(caches)} 个缓存"
+            return pd.DataFrame(columns=CACHE_TABLE_COLUMNS), "暂无缓存"
+
+        page_caches, offset = _page_slice(caches, page, limit)
+
+        rows = [
+            [
+                c["title"],
+                c["current_chapter"],
+                c["total_chapters"],
+                c["status"],
+                c["timestamp"][:19] if c["timestamp"] else "",
+                round(c["size"] / 1024, 2)
+            ]
+            for c in page_caches
+        ]
+        df = pd.DataFrame(rows, columns=CACHE_TABLE_COLUMNS)
+        return df, _page_message("缓存", len(caches), offset, len(page_caches))
     except Exception as e:
         logger.error(f"列出缓存失败: {e}")
         return pd.DataFrame(), f"列出缓存失败: {str(e)}"
@@ -998,7 +1327,9 @@ def handle_clear_all_caches() -> Tuple[pd.DataFrame, str]:
     """清理所有缓存"""
     try:
         caches = list_generation_caches()
-        if not caches:
+        # 文件解析缓存一并清理
+        parse_cleared = clear_parse_cache()
+        if not caches and not parse_cleared:
             return pd.DataFrame(), "❌ 没有缓存可清理"
 
         cleared_count = 0
@@ -1010,16 +1341,19 @@ def handle_clear_all_caches() -> Tuple[pd.DataFrame, str]:
 
         # 刷新缓存列表
         df, msg = handle_list_caches()
-        return df, f"✅ 已清理 {cleared_count}/{len(caches)} 个缓存"
+        result = f"✅ 已清理 {cleared_count}/{len(caches)} 个缓存"
+        if parse_cleared:
+            result += f"，{parse_cleared} 个文件解析缓存"
+        return df, result
     except Exception as e:
         logger.error(f"清理所有缓存失败: {e}")
         return pd.DataFrame(), f"❌ 清理所有缓存失败: {str(e)}"
 
 
 def handle_get_cache_size() -> str:
-    """获取缓存总大小"""
+    """获取缓存总大小（生成缓存 + 文件解析缓存）"""
     try:
-        size_bytes = get_cache_size()
+        size_bytes = get_cache_size() + get_parse_cache_size()
         size_mb = size_bytes / (1024 * 1024)
         if size_mb < 1:
             return f"缓存总大小: {round(size_bytes / 1024, 2)} KB"
@@ -1032,22 +1366,18 @@ def handle_get_cache_size() -> str:
 
 # ==================== 上下文摘要缓存管理 ====================
 
-def handle_list_summary_caches() -> Tuple[pd.DataFrame, str]:
-    """列出所有摘要缓存"""
+def handle_list_summary_caches(page: int = 1, limit: int = LIST_PAGE_SIZE) -> Tuple[pd.DataFrame, str]:
+    """列出摘要缓存（按页，page 从1开始）"""
     try:
         caches = list_summary_caches()
         if not caches:
-            return pd.DataFrame(columns=["项目ID", "章节数", "总大小(KB)"]), "暂无摘要缓存"
-
-        df = pd.DataFrame([
-            {
-                "项目ID": c["project_id"],
-                "章节数": c["chapter_count"],
-                "总大小(KB)": c["size_kb"]
-            }
-            for c in caches
-        ])
-        return df, f"找到 {len(caches)} 个摘要缓存"
+            return pd.DataFrame(columns=SUMMARY_CACHE_TABLE_COLUMNS), "暂无摘要缓存"
+
+        page_caches, offset = _page_slice(caches, page, limit)
+
+        rows = [[c["project_id"], c["chapter_count"], c["size_kb"]] for c in page_caches]
+        df = pd.DataFrame(rows, columns=SUMMARY_CACHE_TABLE_COLUMNS)
+        return df, _page_message("摘要缓存", len(caches), offset, len(page_caches))
     except Exception as e:
         logger.error(f"列出摘要缓存失败: {e}")
         return pd.DataFrame(), f"列出摘要缓存失败: {str(e)}"
@@ -1089,41 +1419,85 @@ def handle_clear_all_summary_caches() -> Tuple[pd.DataFrame, str]:
         return pd.DataFrame(), f"❌ 清理所有摘要缓存失败: {str(e)}"
 
 # ==================== 项目管理 ====================
-def load_projects_list():
-    """加载项目列表"""
+# 项目列表缓存（以项目目录的mtime作为失效依据，并设有TTL）
+_PROJECT_LIST_CACHE = {"mtime": None, "loaded_at": 0.0, "projects": []}
+
+
+def _get_cached_projects() -> List[Dict]:
+    """获取项目列表，目录未变化且未超过TTL时直接返回缓存（调用方不得修改返回值）"""
+    try:
+        mtime = os.stat(PROJECTS_DIR).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    now = time.monotonic()
+    cache = _PROJECT_LIST_CACHE
+    if mtime is not None and cache["mtime"] == mtime and now - cache["loaded_at"] < PROJECT_LIST_TTL:
+        return cache["projects"]
+
     projects = ProjectManager.list_projects()
+    cache["mtime"] = mtime
+    cache["loaded_at"] = now
+    cache["projects"] = projects
+    return projects
+
+
+def load_projects_list(page: int = 1, limit: int = LIST_PAGE_SIZE):
+    """加载项目列表（按页，page 从1开始）"""
+    projects = _get_cached_projects()
     
     if not projects:
-        return pd.DataFrame(columns=["项目名", "类型", "创建时间", "更新时间", "章节数", "完成度"]), "暂无项目"
+        return pd.DataFrame(columns=PROJECT_TABLE_COLUMNS), "暂无项目"
     
-    df = pd.DataFrame([
-        {
-            "项目名": p["title"],
-            "类型": p["genre"],
-            "创建时间": p["created_at"][:10],
-            "更新时间": p["updated_at"][:10],
-            "章节数": f"{p['completed_chapters']}/{p['chapter_count']}",
-            "完成度": f"{int(p['completed_chapters']/max(p['chapter_count'],1)*100)}%"
-        }
-        for p in projects
-    ])
+    page_projects, offset = _page_slice(projects, page, limit)
+    
+    rows = [
+        [
+            p["title"],
+            p["genre"],
+            p["created_at"][:10],
+            p["updated_at"][:10],
+            f"{p['completed_chapters']}/{p['chapter_count']}",
+            f"{int(p['completed_chapters']/max(p['chapter_count'],1)*100)}%"
+        ]
+        for p in page_projects
+    ]
+    df = pd.DataFrame(rows, columns=PROJECT_TABLE_COLUMNS)
     
-    return df, f"找到 {len(projects)} 个项目"
+    return df, _page_message("项目", len(projects), offset, len(page_projects))
 
 
 def get_project_choices():
     """获取项目列表用于下拉框"""
-    projects = ProjectManager.list_projects()
-    if not projects:
-        return []
-    return [p["title"] for p in projects]
+    return [p["title"] for p in _get_cached_projects()]
+
+
+def _iter_novel_blocks(metadata: Dict[str, Any]) -> Iterator[str]:
+    """按章节逐块生成小说文本（避免构建完整的中间列表）"""
+    yield f"# {metadata['title']}\n"
+    yield "\n"
+
+    for chapter in metadata.get('chapters', []):
+        # 使用章节标题（不包含章节号前缀）
+        chapter_title = chapter.get('title', '')
+        # 如果标题包含"第X章:"前缀，提取后面的部分
+        if re.match(r'^第\d+章[:：]', chapter_title):
+            chapter_title = re.sub(r'^第\d+章[:：]\s*', '', chapter_title).strip()
+
+        yield f"## 第{chapter.get('num', 1)}章 {chapter_title}\n"
+        yield "\n"
+
+        # 优先使用content（实际生成的内容），如果没有则使用desc（大纲描述）
+        chapter_content = chapter.get('content', '').strip()
+        if chapter_content and chapter_content not in ['生成成功', '']:
+            yield chapter_content + "\n"
+        else:
+            yield f"（大纲描述：{chapter.get('desc', '')}）\n"
+        yield "\n"
 
 
 def handle_export_project(project_title: str, export_format: str) -> Tuple[Optional[str], str]:
     """导出项目小说 - 从metadata.json读取完整内容，返回文件路径供下载"""
-    import json
-    from pathlib import Path
-    from exporter import export_to_docx, export_to_txt, export_to_markdown, export_to_html
 
     if not project_title or not project_title.strip():
         return None, "❌ 请选择一个项目"
@@ -1134,43 +1508,14 @@ def handle_export_project(project_title: str, export_format: str) -> Tuple[Optio
         if not project:
             return None, f"❌ 项目'{project_title}'不存在"
 
-        # 从metadata.json读取完整项目信息
-        project_dir = Path("projects") / project["id"]
-        metadata_file = project_dir / "metadata.json"
-
-        if not metadata_file.exists():
-            return None, f"❌ 项目元数据文件不存在: {metadata_file}"
-
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
-
-        # 构建完整的小说内容（从metadata中的chapters）
-        content_parts = []
-        content_parts.append(f"# {metadata['title']}")
-        content_parts.append("")
-
-        # 添加章节内容
-        chapters = metadata.get('chapters', [])
-        if chapters:
-            for chapter in chapters:
-                # 使用章节标题（不包含章节号前缀）
-                chapter_title = chapter.get('title', '')
-                # 如果标题包含"第X章:"前缀，提取后面的部分
-                if re.match(r'^第\d+章[:：]', chapter_title):
-                    chapter_title = re.sub(r'^第\d+章[:：]\s*', '', chapter_title).strip()
-
-                content_parts.append(f"## 第{chapter.get('num', 1)}章 {chapter_title}")
-                content_parts.append("")
-
-                # 优先使用content（实际生成的内容），如果没有则使用desc（大纲描述）
-                chapter_content = chapter.get('content', '').strip()
-                if chapter_content and chapter_content not in ['生成成功', '']:
-                    content_parts.append(chapter_content)
-                else:
-                    content_parts.append(f"（大纲描述：{chapter.get('desc', '')}）")
-                content_parts.append("")
+        # 从metadata.json读取完整项目信息（含尚未合并的章节追加日志）
+        metadata = ProjectManager.load_metadata(project["id"])
 
-        novel_content = "\n".join(content_parts)
+        if metadata is None:
+            return None, f"❌ 项目元数据文件不存在: {Path(PROJECTS_DIR) / project['id'] / 'metadata.json'}"
+
+        # 构建完整的小说内容（从metadata中的chapters，逐块拼接）
+        novel_content = "".join(_iter_novel_blocks(metadata))
 
         # 检查是否有实际内容
         if not novel_content.strip() or novel_content.strip() == f"# {metadata['title']}":
@@ -1181,17 +1526,10 @@ def handle_export_project(project_title: str, export_format: str) -> Tuple[Optio
         export_dir.mkdir(exist_ok=True)
 
         # 确定导出格式
-        format_map = {
-            "Word (.docx)": ("docx", export_to_docx),
-            "文本 (.txt)": ("txt", export_to_txt),
-            "Markdown (.md)": ("md", export_to_markdown),
-            "HTML (.html)": ("html", export_to_html),
-        }
-
-        if export_format not in format_map:
+        if export_format not in _EXPORT_FORMATS:
             return None, f"❌ 不支持的导出格式: {export_format}"
 
-        file_ext, export_func = format_map[export_format]
+        file_ext, export_func = _EXPORT_FORMATS[export_format]
 
         # 调用对应的导出函数
         success, result = export_func(novel_content, project_title)
@@ -1220,68 +1558,65 @@ def handle_export_project(project_title: str, export_format: str) -> Tuple[Optio
 
 
 # ==================== 配置管理 ====================
+# 后端表格中用于新增的空行模板（列顺序同 BACKEND_TABLE_COLUMNS）
+_EMPTY_BACKEND_ROW = ["", "", "", "", True, 30, 3]
+
+
 def load_backends_table():
     """加载后端配置表格"""
-    config = get_config()
-    
     if not config.backends:
-        empty_df = pd.DataFrame({
-            "名称": [""],
-            "类型": [""],
-            "Base URL": [""],
-            "模型": [""],
-            "启用": [True],
-            "超时(秒)": [30],
-            "重试次数": [3]
-        })
-        return empty_df
+        return pd.DataFrame([_EMPTY_BACKEND_ROW], columns=BACKEND_TABLE_COLUMNS)
     
-    data = []
-    for backend in config.backends:
-        data.append({
-            "名称": backend.name,
-            "类型": backend.type,
-            "Base URL": backend.base_url,
-            "模型": backend.model,
-            "启用": backend.enabled,
-            "超时(秒)": backend.timeout,
-            "重试次数": backend.retry_times
-        })
+    data = [
+        [
+            backend.name,
+            backend.type,
+            backend.base_url,
+            backend.model,
+            backend.enabled,
+            backend.timeout,
+            backend.retry_times
+        ]
+        for backend in config.backends
+    ]
     
-    df = pd.DataFrame(data)
+    # 添加空行用于新增（一次性构建，避免逐行 pd.concat 复制）
+    data.extend([_EMPTY_BACKEND_ROW] * 3)
     
-    # 添加空行用于新增
-    for _ in range(3):
-        df = pd.concat([df, pd.DataFrame({
-            "名称": [""],
-            "类型": [""],
-            "Base URL": [""],
-            "模型": [""],
-            "启用": [True],
-            "超时(秒)": [30],
-            "重试次数": [3]
-        })], ignore_index=True)
-    
-    return df
+    return pd.DataFrame(data, columns=BACKEND_TABLE_COLUMNS)
+
+
+# 生成参数类型转换表（顺序与 save_backends_config 的参数顺序一致）
+_GEN_CONFIG_COERCERS = {
+    "temperature": float,
+    "top_p": float,
+    "top_k": int,
+    "max_tokens": int,
+    "chapter_target_words": int,
+    "writing_style": str,
+    "writing_tone": str,
+    "character_development": str,
+    "plot_complexity": str,
+    "deterministic_cache": bool,
+}
 
 
-def save_backends_config(temperature, top_p, top_k, max_tokens, target_words, writing_style, writing_tone, character_dev, plot_complexity):
+def save_backends_config(temperature, top_p, top_k, max_tokens, target_words, writing_style, writing_tone, character_dev, plot_complexity, deterministic_cache=False):
     """保存生成参数"""
     try:
-        config = get_config()
+        # 按转换表统一转换参数类型
+        values = (temperature, top_p, top_k, max_tokens, target_words,
+                  writing_style, writing_tone, character_dev, plot_complexity, deterministic_cache)
+        kwargs = {}
+        for (key, coerce), value in zip(_GEN_CONFIG_COERCERS.items(), values):
+            try:
+                kwargs[key] = coerce(value)
+            except (TypeError, ValueError):
+                logger.error(f"生成参数 {key} 无效: {value!r}")
+                return f"保存失败: 参数 {key} 的值无效 ({value})"
         
         # 保存生成参数
-        success, msg = config.update_generation_config(
-            temperature=float(temperature),
-            top_p=float(top_p),
-            top_k=int(top_k),
-            max_tokens=int(max_tokens),
-            chapter_target_words=int(target_words),
-            writing_style=str(writing_style),
-            writing_tone=str(writing_tone),
-            character_development=str(character_dev),
-            plot_complexity=str(plot_complexity)
-        )
+        success, msg = config.update_generation_config(**kwargs)
         
         if not success:
             logger.error(f"保存配置失败: {msg}")
@@ -1295,6 +1630,17 @@ def save_backends_config(temperature, top_p, top_k, max_tokens, target_words, wr
         return f"保存失败: {str(e)}"
 
 
+def reload_config():
+    """从磁盘重新加载配置，并刷新生成参数表单"""
+    success, msg = config.reload()
+    if not success:
+        return (*[gr.update() for _ in _GEN_CONFIG_COERCERS], msg)
+
+    reinit_api_client()
+    logger.info("配置已重新加载")
+    return (*[getattr(config.generation, key) for key in _GEN_CONFIG_COERCERS], msg)
+
+
 def test_backends_connection():
     """测试后端连接"""
     api_client = get_api_client()
@@ -1383,6 +1729,10 @@ def validate_api_key(api_key: str, provider_name: str) -> tuple[bool, str]:
     return True, "密钥格式验证通过"
 
 
+# 模型名称只允许字母、数字、下划线、点和连字符
+_MODEL_NAME_RE = re.compile(r'^[a-zA-Z0-9._-]+$')
+
+
 def validate_model_name(model: str, provider_name: str) -> tuple[bool, str]:
     """验证模型名称"""
     if not model or not model.strip():
@@ -1397,8 +1747,7 @@ def validate_model_name(model: str, provider_name: str) -> tuple[bool, str]:
         return False, "未知的API提供商"
     
     # 基本验证：模型名称应该包含字母、数字、下划线、点或连字符
-    import re
-    if not re.match(r'^[a-zA-Z0-9._-]+$', model):
+    if not _MODEL_NAME_RE.match(model):
         return False, "模型名称只能包含字母、数字、下划线、点和连字符"
     
     return True, "模型名称验证通过"
@@ -1452,12 +1801,9 @@ def add_new_backend(name, backend_type, base_url, api_key, model, timeout, retry
     )
 
     if result["success"]:
-        # 刷新列表
-        backends_result = config_api.list_backends()
-        if backends_result["success"]:
-            df_data = pd.DataFrame(backends_result["data"])
-            return df_data, f"✅ {result['message']}"
-        return pd.DataFrame(), f"✅ {result['message']}"
+        # 变更接口直接返回最新的后端列表，无需再次查询
+        df_data = pd.DataFrame(result.get("data", []))
+        return df_data, f"✅ {result['message']}"
     else:
         return pd.DataFrame(), f"❌ {result['message']}"
 
@@ -1482,11 +1828,9 @@ def delete_backend_by_name(backend_name):
     result = config_api.delete_backend(backend_name)
     
     if result["success"]:
-        backends_result = config_api.list_backends()
-        if backends_result["success"]:
-            df_data = pd.DataFrame(backends_result["data"])
-            return df_data, f"✅ {result['message']}"
-        return pd.DataFrame(), f"✅ {result['message']}"
+        # 变更接口直接返回最新的后端列表，无需再次查询
+        df_data = pd.DataFrame(result.get("data", []))
+        return df_data, f"✅ {result['message']}"
     else:
         return pd.DataFrame(), f"❌ {result['message']}"
 
@@ -1499,11 +1843,9 @@ def toggle_backend_status(backend_name, enabled):
     result = config_api.toggle_backend(backend_name, enabled)
     
     if result["success"]:
-        backends_result = config_api.list_backends()
-        if backends_result["success"]:
-            df_data = pd.DataFrame(backends_result["data"])
-            return df_data, f"✅ {result['message']}"
-        return pd.DataFrame(), f"✅ {result['message']}"
+        # 变更接口直接返回最新的后端列表，无需再次查询
+        df_data = pd.DataFrame(result.get("data", []))
+        return df_data, f"✅ {result['message']}"
     else:
         return pd.DataFrame(), f"❌ {result['message']}"
 
@@ -1642,7 +1984,6 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
             continue_plot_idea = gr.Textbox(label="📖 主线剧情想法", lines=3, placeholder="核心冲突、发展方向、结局走向等（可选）")
 
             continue_parse_status = gr.Textbox(label="解析状态", interactive=False)
-            continue_segments = gr.State([])
 
             continue_btn = gr.Button("开始续写", variant="primary", scale=2)
 
@@ -1667,23 +2008,15 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
 
         # 事件绑定 - 重写模式
         # 分段方式切换
-        def update_split_ui_rewrite(split_method):
-            if split_method == "按字数分段":
-                return gr.update(visible=True), gr.update(visible=False)
-            elif split_method == "按固定文本分段":
-                return gr.update(visible=False), gr.update(visible=True)
-            else:
-                return gr.update(visible=False), gr.update(visible=False)
-
         split_method_rewrite.change(
-            update_split_ui_rewrite,
+            update_split_ui,
             inputs=[split_method_rewrite],
             outputs=[word_count_group_rewrite, pattern_group_rewrite]
         )
 
         # 解析文件（使用新的分段函数）
         parse_btn.click(
-            parse_novel_file_with_split,
+            parse_novel_file_for_rewrite,
             inputs=[file_input, split_method_rewrite, word_count_rewrite, pattern_rewrite, keep_marker_rewrite],
             outputs=[segments, parse_status]
         )
@@ -1698,32 +2031,17 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
 
         # 事件绑定 - 续写模式
         # 分段方式切换
-        def update_split_ui_continue(split_method):
-            if split_method == "按字数分段":
-                return gr.update(visible=True), gr.update(visible=False)
-            elif split_method == "按固定文本分段":
-                return gr.update(visible=False), gr.update(visible=True)
-            else:
-                return gr.update(visible=False), gr.update(visible=False)
-
         split_method_continue.change(
-            update_split_ui_continue,
+            update_split_ui,
             inputs=[split_method_continue],
             outputs=[word_count_group_continue, pattern_group_continue]
         )
 
-        # 解析文件（使用新的分段函数）
+        # 解析文件，并同时将内容填充到已有内容框
         continue_parse_btn.click(
-            parse_novel_file_with_split,
+            parse_novel_file_with_text,
             inputs=[continue_file_input, split_method_continue, word_count_continue, pattern_continue, keep_marker_continue],
-            outputs=[continue_segments, continue_parse_status]
-        )
-
-        # 当解析完成后，将内容填充到已有内容框
-        continue_parse_btn.click(
-            lambda segments: "\n\n".join(segments) if segments else "",
-            inputs=[continue_segments],
-            outputs=[continue_original]
+            outputs=[continue_parse_status, continue_original]
         )
 
         continue_btn.click(
@@ -1789,8 +2107,6 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
 
         polish_parse_status = gr.Textbox(label="解析状态", interactive=False)
 
-        polish_segments = gr.State([])
-
         with gr.Row():
             polish_btn = gr.Button("开始润色", variant="primary", scale=1)
             polish_all_btn = gr.Button("润色并提供建议", variant="primary", scale=1)
@@ -1804,25 +2120,17 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
 
         # 事件绑定
         # 分段方式切换
-        def update_split_ui_polish(split_method):
-            if split_method == "按字数分段":
-                return gr.update(visible=True), gr.update(visible=False)
-            elif split_method == "按固定文本分段":
-                return gr.update(visible=False), gr.update(visible=True)
-            else:
-                return gr.update(visible=False), gr.update(visible=False)
-
         split_method_polish.change(
-            update_split_ui_polish,
+            update_split_ui,
             inputs=[split_method_polish],
             outputs=[word_count_group_polish, pattern_group_polish]
         )
 
-        # 解析文件（使用新的分段函数）
+        # 解析文件，并同时将内容填充到原文框
         polish_parse_btn.click(
-            parse_novel_file_with_split,
+            parse_novel_file_with_text,
             inputs=[polish_file_input, split_method_polish, word_count_polish, pattern_polish, keep_marker_polish],
-            outputs=[polish_segments, polish_parse_status]
+            outputs=[polish_parse_status, original_text]
         )
 
         # 简单润色
@@ -1840,13 +2148,6 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
             outputs=[polished_text, polish_suggestions, polish_status],
             show_progress=True
         )
-
-        # 当解析完成后，将内容填充到原文框
-        polish_parse_btn.click(
-            lambda segments: "\n\n".join(segments) if segments else "",
-            inputs=[polish_segments],
-            outputs=[original_text]
-        )
     
     # ==================== Tab 2: 小说创作 ====================
     with gr.Tab("✍️ 从零开始创作"):
@@ -1954,9 +2255,11 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
 
         # 检查缓存状态（当标题改变时）
         title_input.change(
-            check_cache_status,
+            debounced_check_cache_status,
             inputs=[title_input],
-            outputs=[cache_status_display, cache_timestamp_display]
+            outputs=[cache_status_display, cache_timestamp_display],
+            trigger_mode="always_last",
+            show_progress="hidden"
         )
 
         # 根据上下文模式显示/隐藏摘要设置
@@ -2045,11 +2348,14 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
     with gr.Tab("📂 项目管理"):
         gr.Markdown("### 管理所有创作项目")
 
-        refresh_btn = gr.Button("🔄 刷新项目列表")
+        with gr.Row():
+            refresh_btn = gr.Button("🔄 刷新项目列表", scale=3)
+            projects_page = gr.Number(label=f"页码（每页{LIST_PAGE_SIZE}个）", value=1, minimum=1, precision=0, scale=1)
         projects_df = gr.Dataframe(label="我的项目", interactive=False)
         status_text = gr.Textbox(label="状态", interactive=False)
 
-        refresh_btn.click(load_projects_list, outputs=[projects_df, status_text])
+        refresh_btn.click(load_projects_list, inputs=[projects_page], outputs=[projects_df, status_text])
+        projects_page.submit(load_projects_list, inputs=[projects_page], outputs=[projects_df, status_text])
 
         # 初始加载
         demo.load(load_projects_list, outputs=[projects_df, status_text])
@@ -2208,8 +2514,6 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
             with gr.Tab("📝 生成参数"):
                 gr.Markdown("#### 调整小说生成的各项参数")
                 
-                config = get_config()
-                
                 with gr.Row():
                     temp_slider = gr.Slider(
                         0.1, 2.0,
@@ -2277,16 +2581,29 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
                         label="情节复杂度"
                     )
                 
-                save_btn = gr.Button("💾 保存生成参数", variant="primary")
+                deterministic_cb = gr.Checkbox(
+                    value=config.generation.deterministic_cache,
+                    label="确定性模式",
+                    info="相同输入的重写/润色/续写直接复用7天内的缓存结果，节省API调用"
+                )
+                
+                with gr.Row():
+                    save_btn = gr.Button("💾 保存生成参数", variant="primary")
+                    reload_btn = gr.Button("🔄 重新加载配置文件", variant="secondary")
                 save_status = gr.Textbox(label="保存状态", interactive=False)
                 
-                # 事件绑定
+                # 事件绑定（表单顺序与 _GEN_CONFIG_COERCERS 一致）
+                gen_param_inputs = [temp_slider, topp_slider, topk_slider, maxtokens_num,
+                                    target_words, style_dd, tone_dd, char_dd, plot_dd, deterministic_cb]
                 save_btn.click(
                     save_backends_config,
-                    inputs=[temp_slider, topp_slider, topk_slider, maxtokens_num,
-                            target_words, style_dd, tone_dd, char_dd, plot_dd],
+                    inputs=gen_param_inputs,
                     outputs=[save_status]
                 )
+                reload_btn.click(
+                    reload_config,
+                    outputs=gen_param_inputs + [save_status]
+                )
 
             # ========== 缓存管理子标签 ==========
             with gr.Tab("💾 缓存管理"):
@@ -2298,6 +2615,7 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
                 with gr.Row():
                     list_caches_btn = gr.Button("🔄 刷新缓存列表", variant="secondary", scale=1)
                     get_cache_size_btn = gr.Button("📊 获取缓存大小", variant="secondary", scale=1)
+                    caches_page = gr.Number(label=f"页码（每页{LIST_PAGE_SIZE}个）", value=1, minimum=1, precision=0, scale=1)
 
                 caches_df = gr.Dataframe(label="缓存列表", interactive=False)
 
@@ -2308,7 +2626,8 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
                 cache_operation_status = gr.Textbox(label="操作状态", interactive=False, lines=2)
 
                 # 事件绑定
-                list_caches_btn.click(handle_list_caches, outputs=[caches_df, cache_operation_status])
+                list_caches_btn.click(handle_list_caches, inputs=[caches_page], outputs=[caches_df, cache_operation_status])
+                caches_page.submit(handle_list_caches, inputs=[caches_page], outputs=[caches_df, cache_operation_status])
                 get_cache_size_btn.click(handle_get_cache_size, outputs=[cache_size_display])
                 clear_selected_cache_btn.click(handle_clear_cache, inputs=[gr.State("")], outputs=[caches_df, cache_operation_status])
                 clear_all_caches_btn.click(handle_clear_all_caches, outputs=[caches_df, cache_operation_status])
@@ -2322,6 +2641,7 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
                 with gr.Row():
                     list_summary_caches_btn = gr.Button("🔄 刷新摘要列表", variant="secondary", scale=1)
                     get_summary_cache_size_btn = gr.Button("📊 获取摘要大小", variant="secondary", scale=1)
+                    summary_caches_page = gr.Number(label=f"页码（每页{LIST_PAGE_SIZE}个）", value=1, minimum=1, precision=0, scale=1)
 
                 summary_caches_df = gr.Dataframe(label="摘要缓存列表", interactive=False)
 
@@ -2331,7 +2651,8 @@ with gr.Blocks(title="AI小说创作工具 Pro - 生产级版本") as demo:
                 summary_cache_operation_status = gr.Textbox(label="操作状态", interactive=False, lines=2)
 
                 # 事件绑定
-                list_summary_caches_btn.click(handle_list_summary_caches, outputs=[summary_caches_df, summary_cache_operation_status])
+                list_summary_caches_btn.click(handle_list_summary_caches, inputs=[summary_caches_page], outputs=[summary_caches_df, summary_cache_operation_status])
+                summary_caches_page.submit(handle_list_summary_caches, inputs=[summary_caches_page], outputs=[summary_caches_df, summary_cache_operation_status])
                 get_summary_cache_size_btn.click(handle_get_summary_cache_size, outputs=[summary_cache_size_display])
                 clear_summary_cache_btn.click(handle_clear_all_summary_caches, outputs=[summary_caches_df, summary_cache_operation_status])
 
@@ -2412,7 +2733,7 @@ if __name__ == "__main__":
     # 测试初始化
     try:
         api_client = get_api_client()
-        backends = get_config().get_enabled_backends()
+        backends = config.get_enabled_backends()
         logger.info(f"已加载 {len(backends)} 个后端")
 
         if not backends:
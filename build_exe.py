@@ -6,210 +6,131 @@ AI小说创作工具 Pro - 打包脚本
 作者：幻城
 """
 import os
+import re
 import sys
+import hashlib
 import subprocess
+import importlib.metadata
 from pathlib import Path
 
 # 项目根目录
 PROJECT_ROOT = Path(__file__).parent
 
+# 最近一次成功打包时输入内容的哈希
+BUILD_SENTINEL = PROJECT_ROOT / "cache" / "build_exe.sentinel"
 
-def install_dependencies():
-    """安装打包所需的依赖"""
-    print("=" * 60)
-    print("安装打包依赖...")
-    print("=" * 60)
+# build_exe.spec 中作为 datas 打包的目录（修改 spec 的 datas 时需同步）
+BUILD_DATA_DIRS = ("config", "templates")
 
-    requirements = [
-        "pyinstaller>=6.0.0",
-    ]
 
+def _version_tuple(version):
+    """把版本号转换为可比较的整数元组(忽略 rc/dev 等后缀)"""
+    parts = []
+    for part in version.split("."):
+        digits = re.match(r"\d+", part)
+        if not digits:
+            break
+        parts.append(int(digits.group()))
+    return tuple(parts)
+
+
+def _missing_requirements(requirements):
+    """返回未安装或版本过低的依赖(只处理 name>=version 形式)"""
+    missing = []
     for req in requirements:
-        print(f"安装 {req}...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", req])
+        name, _, min_version = req.partition(">=")
+        try:
+            installed = importlib.metadata.version(name.strip())
+        except importlib.metadata.PackageNotFoundError:
+            missing.append(req)
+            continue
+        if min_version and _version_tuple(installed) < _version_tuple(min_version.strip()):
+            missing.append(req)
+    return missing
 
-    print("✅ 依赖安装完成")
 
+def _pip_install(requirements):
+    """一次 pip 调用安装所有依赖(跳过 pip 自身的版本检查和交互)"""
+    env = {**os.environ, "PIP_DISABLE_PIP_VERSION_CHECK": "1", "PIP_NO_INPUT": "1"}
+    subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", *requirements], env=env)
 
-def build_exe():
-    """使用PyInstaller打包成exe"""
+
+def install_dependencies():
+    """安装打包所需的依赖"""
     print("=" * 60)
-    print("开始打包成exe（单文件版本）...")
+    print("安装打包依赖...")
     print("=" * 60)
 
-    # PyInstaller参数
-    pyinstaller_args = [
-        "pyinstaller",
-        "--name=AI小说创作工具Pro",
-        "--icon=icon.ico" if (PROJECT_ROOT / "icon.ico").exists() else "--icon=NONE",
-        "--onefile",  # 打包成单个exe文件
-        "--windowed",  # 不显示控制台窗口
-        "--clean",  # 清理缓存
-        "--noconfirm",  # 覆盖输出目录而不询问
-        "--runtime-hook=hook-safehttpx.py",  # 运行时钩子
-        "--add-data=config;config",  # 包含配置目录
-        "--add-data=templates;templates",  # 包含模板目录
-        # Gradio相关
-        "--hidden-import=gradio",
-        "--hidden-import=gradio.themes",
-        "--hidden-import=gradio.themes.soft",
-        "--hidden-import=gradio.themes.base",
-        "--hidden-import=gradio.components",
-        "--hidden-import=gradio.components.base",
-        "--hidden-import=gradio.templates",
-        "--hidden-import=gradio_client",
-        # httpx相关（解决safehttpx问题）
-        "--hidden-import=httpx",
-        "--hidden-import=httpx._transports.default",
-        "--hidden-import=safehttpx",
-        "--hidden-import=aiohttp",
-        "--hidden-import=websockets",
-        "--hidden-import=websockets.client",
-        "--hidden-import=websockets.legacy",
-        "--hidden-import=certifi",
-        "--hidden-import=charset_normalizer",
-        "--hidden-import=idna",
-        "--hidden-import=sniffio",
-        "--hidden-import=anyio",
-        "--hidden-import=anyio.abc",
-        "--hidden-import=anyio.streams",
-        "--hidden-import=h11",
-        "--hidden-import=h2",
-        "--hidden-import=hpack",
-        "--hidden-import=hyperframe",
-        # 其他依赖
-        "--hidden-import=openai",
-        "--hidden-import=pandas",
-        "--hidden-import=docx",
-        "--hidden-import=docx.oxml",
-        "--hidden-import=docx.oxml.ns",
-        "--hidden-import=PIL",
-        "--hidden-import=PIL.Image",
-        "--hidden-import=PIL.ImageTk",
-        "--hidden-import=logging",
-        "--hidden-import=pathlib",
-        "--hidden-import=yaml",
-        "--hidden-import=fitz",
-        "--hidden-import=ebooklib",
-        "--hidden-import=bs4",
-        # numpy相关（gradio必需）
-        "--hidden-import=numpy",
-        "--hidden-import=numpy.core",
-        "--hidden-import=numpy.core._multiarray_umath",
-        # 收集所有数据文件
-        "--collect-all=gradio",
-        "--collect-data=gradio",
-        "--collect-all=httpx",
-        "--collect-data=httpx",
-        # 排除不需要的模块
-        "--exclude-module=matplotlib",
-        "--exclude-module=scipy",
-        "--exclude-module=tkinter",
-        "--exclude-module=test",
-        "--exclude-module=pytest",
-        # 注意：不要排除 setuptools，因为 pkg_resources 需要它
-        # 注意：不要排除 numpy，因为 gradio 需要它
-        "app.py",  # 主程序入口
+    requirements = [
+        "pyinstaller>=6.6.0",  # --optimize 需要 6.6+
     ]
 
-    # 执行打包命令
-    print(f"执行命令: {' '.join(pyinstaller_args)}")
-    subprocess.check_call(pyinstaller_args)
+    missing = _missing_requirements(requirements)
+    if missing:
+        print(f"安装 {' '.join(missing)}...")
+        _pip_install(missing)
+    else:
+        print("✓ 依赖均已安装")
 
-    print("\n" + "=" * 60)
-    print("✅ 单文件版打包完成！")
-    print(f"可执行文件位置: {PROJECT_ROOT / 'dist' / 'AI小说创作工具Pro.exe'}")
-    print("\n注意：首次运行可能较慢（需要解压临时文件）")
-    print("=" * 60)
+    print("✅ 依赖安装完成")
 
 
-def build_portable_exe():
-    """打包成便携版（文件夹形式，启动更快）"""
+def _build_inputs_hash():
+    """
+    打包输入的哈希，用于跳过内容未变化的重复打包：
+    spec文件、项目源码、spec中打包的数据目录，以及Python和已安装依赖的版本
+    """
+    digest = hashlib.sha256()
+    inputs = [PROJECT_ROOT / "build_exe.spec"] + sorted(PROJECT_ROOT.glob("*.py"))
+    for data_dir in BUILD_DATA_DIRS:
+        inputs += sorted(path for path in (PROJECT_ROOT / data_dir).rglob("*") if path.is_file())
+    for path in inputs:
+        digest.update(path.relative_to(PROJECT_ROOT).as_posix().encode("utf-8"))
+        digest.update(path.read_bytes())
+
+    # 升级 gradio 等依赖后打包结果也会变化
+    versions = sorted(
+        f"{dist.metadata['Name']}=={dist.version}"
+        for dist in importlib.metadata.distributions()
+    )
+    digest.update(sys.version.encode("utf-8"))
+    digest.update("\n".join(versions).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def build_portable_exe(force=False):
+    """按 build_exe.spec 打包成便携版（文件夹形式，启动更快）"""
     print("=" * 60)
     print("开始打包成便携版（文件夹形式）...")
     print("=" * 60)
 
-    # PyInstaller参数（便携版）
+    # 打包参数统一维护在 build_exe.spec 中
+    # 不提供 --onefile：单文件版每次启动都要把整个归档解压到临时目录（并被杀毒软件重新扫描），
+    # 对 Gradio 这种体积的应用会带来数秒的启动延迟
+    exe_path = PROJECT_ROOT / 'dist' / 'AI小说创作工具Pro' / 'AI小说创作工具Pro.exe'
+    inputs_hash = _build_inputs_hash()
+    if not force and exe_path.exists() and BUILD_SENTINEL.exists() \
+            and BUILD_SENTINEL.read_text(encoding="utf-8").strip() == inputs_hash:
+        print("✓ spec文件和源码均未变化，跳过打包（使用 --force 强制重新打包）")
+        print(f"可执行文件位置: {exe_path}")
+        return
+
     pyinstaller_args = [
         "pyinstaller",
-        "--name=AI小说创作工具Pro",
-        "--icon=icon.ico" if (PROJECT_ROOT / "icon.ico").exists() else "--icon=NONE",
-        "--onedir",  # 打包成文件夹形式（启动更快）
-        "--windowed",
         "--clean",
         "--noconfirm",
-        "--runtime-hook=hook-safehttpx.py",  # 运行时钩子
-        "--add-data=config;config",
-        "--add-data=templates;templates",
-        # Gradio相关
-        "--hidden-import=gradio",
-        "--hidden-import=gradio.themes",
-        "--hidden-import=gradio.themes.soft",
-        "--hidden-import=gradio.themes.base",
-        "--hidden-import=gradio.components",
-        "--hidden-import=gradio.components.base",
-        "--hidden-import=gradio.templates",
-        "--hidden-import=gradio_client",
-        # httpx相关
-        "--hidden-import=httpx",
-        "--hidden-import=httpx._transports.default",
-        "--hidden-import=safehttpx",
-        "--hidden-import=aiohttp",
-        "--hidden-import=websockets",
-        "--hidden-import=websockets.client",
-        "--hidden-import=websockets.legacy",
-        "--hidden-import=certifi",
-        "--hidden-import=charset_normalizer",
-        "--hidden-import=idna",
-        "--hidden-import=sniffio",
-        "--hidden-import=anyio",
-        "--hidden-import=anyio.abc",
-        "--hidden-import=anyio.streams",
-        "--hidden-import=h11",
-        "--hidden-import=h2",
-        "--hidden-import=hpack",
-        "--hidden-import=hyperframe",
-        # 其他依赖
-        "--hidden-import=openai",
-        "--hidden-import=pandas",
-        "--hidden-import=docx",
-        "--hidden-import=docx.oxml",
-        "--hidden-import=docx.oxml.ns",
-        "--hidden-import=PIL",
-        "--hidden-import=PIL.Image",
-        "--hidden-import=PIL.ImageTk",
-        "--hidden-import=logging",
-        "--hidden-import=pathlib",
-        "--hidden-import=yaml",
-        "--hidden-import=fitz",
-        "--hidden-import=ebooklib",
-        "--hidden-import=bs4",
-        # numpy相关（gradio必需）
-        "--hidden-import=numpy",
-        "--hidden-import=numpy.core",
-        "--hidden-import=numpy.core._multiarray_umath",
-        # 收集所有数据文件
-        "--collect-all=gradio",
-        "--collect-data=gradio",
-        "--collect-all=httpx",
-        "--collect-data=httpx",
-        # 排除不需要的模块
-        "--exclude-module=matplotlib",
-        "--exclude-module=scipy",
-        "--exclude-module=tkinter",
-        "--exclude-module=test",
-        "--exclude-module=pytest",
-        # 注意：不要排除 setuptools，因为 pkg_resources 需要它
-        # 注意：不要排除 numpy，因为 gradio 需要它
-        "app.py",
+        str(PROJECT_ROOT / "build_exe.spec"),
     ]
 
     print(f"执行命令: {' '.join(pyinstaller_args)}")
     subprocess.check_call(pyinstaller_args)
 
+    BUILD_SENTINEL.parent.mkdir(parents=True, exist_ok=True)
+    BUILD_SENTINEL.write_text(inputs_hash, encoding="utf-8")
+
     print("\n" + "=" * 60)
     print("✅ 便携版打包完成！")
-    print(f"可执行文件位置: {PROJECT_ROOT / 'dist' / 'AI小说创作工具Pro' / 'AI小说创作工具Pro.exe'}")
+    print(f"可执行文件位置: {exe_path}")
     print("请将整个 dist/AI小说创作工具Pro 文件夹分发给用户")
     print("=" * 60)
 
@@ -232,7 +153,7 @@ beautifulsoup4>=4.12.0  # EPUB支持
 PyYAML>=6.0  # YAML配置支持
 
 # 打包依赖
-pyinstaller>=6.0.0
+pyinstaller>=6.6.0
 """
 
     with open(PROJECT_ROOT / "build_requirements.txt", "w", encoding="utf-8") as f:
@@ -243,33 +164,20 @@ pyinstaller>=6.0.0
 
 if __name__ == "__main__":
     # 检查命令行参数
-    if len(sys.argv) > 1:
-        mode = sys.argv[1]
-        if mode == "portable":
-            install_dependencies()
-            build_portable_exe()
-        elif mode == "single":
-            install_dependencies()
-            build_exe()
-        else:
-            print("用法:")
-            print("  python build_exe.py single   - 打包成单个exe文件")
-            print("  python build_exe.py portable - 打包成便携版（文件夹）")
-    else:
-        # 默认打包成便携版（推荐）
-        print("AI小说创作工具 Pro - 打包工具")
-        print("\n请选择打包模式:")
-        print("1. 便携版（文件夹形式，启动更快，推荐）")
-        print("2. 单文件版（单个exe文件，体积较大）")
-
-        choice = input("\n请输入选择 (1/2，默认1): ").strip()
-
-        install_dependencies()
-
-        if choice == "2":
-            build_exe()
-        else:
-            build_portable_exe()
+    force = "--force" in sys.argv[1:]
+    args = [arg for arg in sys.argv[1:] if arg != "--force"]
+    mode = args[0] if args else "portable"
+    if mode == "single":
+        print("⚠️  单文件版已停用（每次启动需解压全部文件，启动慢），改为打包便携版")
+    elif mode != "portable":
+        print("用法:")
+        print("  python build_exe.py          - 打包成便携版（文件夹）")
+        print("  python build_exe.py portable - 同上")
+        print("  追加 --force 可忽略缓存强制重新打包")
+        sys.exit(1)
+
+    install_dependencies()
+    build_portable_exe(force=force)
 
     # 创建requirements文件
     create_build_requirements()
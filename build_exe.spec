@@ -1,9 +1,9 @@
 # -*- mode: python ; coding: utf-8 -*-
 """
-AI小说创作工具 Pro - PyInstaller配置文件
+AI小说创作工具 Pro - PyInstaller配置文件（便携版，由 build_exe.py 调用）
 
 使用方法:
-    pyinstaller build_exe.spec
+    pyinstaller --noconfirm build_exe.spec
 
 版权所有 © 2026 新疆幻城网安科技有限责任公司 (幻城科技)
 作者：幻城
@@ -11,72 +11,80 @@ AI小说创作工具 Pro - PyInstaller配置文件
 
 import os
 import sys
+from PyInstaller.utils.hooks import collect_data_files, collect_submodules
 
 block_cipher = None
 
+# 数据文件（gradio 只收集子模块和数据，不用 collect_all 带入多余的二进制）
+datas = [
+    ('config', 'config'),
+    ('templates', 'templates'),
+]
+datas += collect_data_files('gradio')
+datas += collect_data_files('httpx')
+
+hiddenimports = [
+    # Gradio相关
+    'gradio',
+    'gradio.themes',
+    'gradio.themes.soft',
+    'gradio.themes.base',
+    'gradio.components',
+    'gradio.components.base',
+    'gradio.templates',
+    'gradio_client',
+    # httpx相关（未启用HTTP/2，不需要 h2/hpack/hyperframe）
+    'httpx',
+    'httpx._transports.default',
+    'safehttpx',
+    'websockets',
+    'websockets.client',
+    'websockets.legacy',
+    'certifi',
+    'charset_normalizer',
+    'idna',
+    'sniffio',
+    'anyio',
+    'anyio.abc',
+    'anyio.streams',
+    'h11',
+    # 其他依赖
+    'openai',
+    'pandas',
+    'docx',
+    'docx.oxml',
+    'docx.oxml.ns',
+    'PIL',
+    'PIL.Image',
+    'yaml',
+    'fitz',  # PyMuPDF
+    'ebooklib',
+    'bs4',
+    # numpy相关（gradio必需）
+    'numpy',
+    'numpy.core',
+    'numpy.core._multiarray_umath',
+]
+hiddenimports += collect_submodules('gradio')
+
 a = Analysis(
     ['app.py'],
     pathex=[],
     binaries=[],
-    datas=[
-        ('config', 'config'),
-        ('templates', 'templates'),
-    ],
-    hiddenimports=[
-        'gradio',
-        'gradio.themes',
-        'gradio.themes.soft',
-        'gradio.themes.base',
-        'gradio.components',
-        'gradio.components.base',
-        'gradio.templates',
-        'gradio_client',
-        'openai',
-        'pandas',
-        'docx',
-        'docx.oxml',
-        'docx.oxml.ns',
-        'PIL',
-        'PIL.Image',
-        'PIL.ImageTk',
-        'logging',
-        'pathlib',
-        'yaml',
-        'fitz',  # PyMuPDF
-        'ebooklib',
-        'bs4',
-        'httpx',
-        'httpx._transports.default',
-        'safehttpx',
-        'aiohttp',
-        'websockets',
-        'websockets.client',
-        'websockets.legacy',
-        'certifi',
-        'charset_normalizer',
-        'idna',
-        'sniffio',
-        'anyio',
-        'anyio.abc',
-        'anyio.streams',
-        'h11',
-        'h2',
-        'hpack',
-        'hyperframe',
-        'zstandard',
-        'numpy',  # gradio需要
-        'numpy.core',
-        'numpy.core._multiarray_umath',
-    ],
-    hookspath=[],
+    datas=datas,
+    hiddenimports=hiddenimports,
+    hookspath=['.'],  # 打包时由 hook-safehttpx.py 收集 safehttpx 的 version.txt
     hooksconfig={},
-    runtime_hooks=['hook-safehttpx.py'],  # 运行时钩子
+    runtime_hooks=[],
     excludes=[
         'matplotlib',
         'scipy',
         'tkinter',
         'test',
         'pytest',
+        'pandas.tests',
+        'numpy.tests',
+        'PIL.ImageTk',
         # 注意：不要排除 setuptools，因为 pkg_resources 需要它
         # 注意：不要排除 distutils，因为 setuptools 依赖它
         # 注意：不要排除 numpy，因为 gradio 需要它
@@ -84,7 +92,10 @@ a = Analysis(
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
-    noarchive=False,
+    # 不打包进压缩的PYZ归档，.pyc以普通文件存放，启动时无需逐个解压
+    noarchive=True,
+    # 以 -O 级别编译字节码（去掉assert；不用2级，部分第三方库依赖文档字符串）
+    optimize=1,
 )
 
 pyz = PYZ(a.pure, a.zipped_data, cipher=block_cipher)
@@ -98,7 +109,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,  # 不用UPX压缩DLL，避免启动时解压
     console=False,  # 不显示控制台窗口
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -111,10 +122,9 @@ exe = EXE(
 coll = COLLECT(
     exe,
     a.binaries,
-    a.zipfiles,
     a.datas,
     strip=False,
-    upx=True,
+    upx=False,
     upx_exclude=[],
     name='AI小说创作工具Pro',
 )
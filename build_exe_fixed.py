@@ -5,15 +5,24 @@ AI小说创作工具 Pro - 修复版打包脚本
 版权所有 © 2026 新疆幻城网安科技有限责任公司 (幻城科技)
 作者：幻城
 """
-import os
 import sys
+import compileall
 import subprocess
 from pathlib import Path
 import shutil
 
+# 依赖检查/安装与 build_exe.py 共用
+from build_exe import _missing_requirements, _pip_install
+
 # 项目根目录
 PROJECT_ROOT = Path(__file__).parent
 
+# 打包所需的依赖
+BUILD_REQUIREMENTS = [
+    "pyinstaller>=6.6.0",  # spec中的 optimize 需要 6.6+
+    "setuptools>=65.0.0",
+]
+
 
 def clean_build_dirs():
     """清理之前的构建文件"""
@@ -37,14 +46,13 @@ def install_dependencies():
     print("安装/更新打包依赖...")
     print("=" * 60)
 
-    requirements = [
-        "pyinstaller>=6.0.0",
-        "setuptools>=65.0.0",
-    ]
-
-    for req in requirements:
-        print(f"检查 {req}...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "--upgrade", req])
+    # 只读取已安装包的元数据，开销很小，每次都检查以发现被卸载或降级的依赖
+    missing = _missing_requirements(BUILD_REQUIREMENTS)
+    if missing:
+        print(f"安装 {' '.join(missing)}...")
+        _pip_install(missing)
+    else:
+        print("✓ 依赖均已安装")
 
     print("✅ 依赖安装完成\n")
 
@@ -80,10 +88,14 @@ def check_safehttpx():
         return True
 
 
-def build_with_fixed_spec(portable=True):
-    """使用修复后的spec文件打包"""
+def build_with_fixed_spec(clean=True):
+    """
+    使用修复后的spec文件打包(clean=False 时复用 build/ 中的分析缓存做增量打包)
+
+    spec文件固定为文件夹形式(onedir)的便携版,单文件版每次启动都要解压全部文件,已停用
+    """
     print("=" * 60)
-    print(f"开始打包({'便携版' if portable else '单文件版'})...")
+    print("开始打包(便携版)...")
     print("=" * 60)
 
     # 使用修复后的spec文件
@@ -96,14 +108,13 @@ def build_with_fixed_spec(portable=True):
     # PyInstaller参数
     pyinstaller_args = [
         "pyinstaller",
-        "--clean",
         "--noconfirm",
+        "--workpath", str(PROJECT_ROOT / "build"),
+        "--distpath", str(PROJECT_ROOT / "dist"),
         str(spec_file),
     ]
-
-    # 如果需要单文件版本,修改spec文件
-    if not portable:
-        print("注意: 单文件版本可能会有启动慢和部分功能问题,推荐使用便携版")
+    if clean:
+        pyinstaller_args.insert(1, "--clean")
 
     # 执行打包命令
     print(f"\n执行命令: {' '.join(pyinstaller_args)}\n")
@@ -117,18 +128,14 @@ def build_with_fixed_spec(portable=True):
     print("✅ 打包完成！")
     print("=" * 60)
 
-    if portable:
-        exe_path = PROJECT_ROOT / 'dist' / 'AI小说创作工具Pro' / 'AI小说创作工具Pro.exe'
-        print(f"\n可执行文件位置: {exe_path}")
-        print("\n请将整个 dist/AI小说创作工具Pro 文件夹分发给用户")
-        print("\n文件夹结构:")
-        print("  dist/AI小说创作工具Pro/")
-        print("  ├── AI小说创作工具Pro.exe  (主程序)")
-        print("  ├── _internal/              (依赖库)")
-        print("  └── ...")
-    else:
-        exe_path = PROJECT_ROOT / 'dist' / 'AI小说创作工具Pro.exe'
-        print(f"\n可执行文件位置: {exe_path}")
+    exe_path = PROJECT_ROOT / 'dist' / 'AI小说创作工具Pro' / 'AI小说创作工具Pro.exe'
+    print(f"\n可执行文件位置: {exe_path}")
+    print("\n请将整个 dist/AI小说创作工具Pro 文件夹分发给用户")
+    print("\n文件夹结构:")
+    print("  dist/AI小说创作工具Pro/")
+    print("  ├── AI小说创作工具Pro.exe  (主程序)")
+    print("  ├── _internal/              (依赖库)")
+    print("  └── ...")
 
     print("\n" + "=" * 60)
     print("🎉 打包成功!")
@@ -136,6 +143,22 @@ def build_with_fixed_spec(portable=True):
     return True
 
 
+def precompile_bundle():
+    """预编译便携版中以源码形式收集的 .py 文件(如 gradio 需要保留源码)"""
+    # 打包后的程序不会写入 __pycache__,这些 .py 每次启动都要重新编译
+    internal_dir = PROJECT_ROOT / 'dist' / 'AI小说创作工具Pro' / '_internal'
+    if not internal_dir.exists():
+        print(f"⚠️  未找到 {internal_dir},跳过预编译")
+        return
+
+    print("预编译打包目录中的 .py 文件...")
+    ok = compileall.compile_dir(str(internal_dir), quiet=1, workers=0)
+    if ok:
+        print("✓ 预编译完成")
+    else:
+        print("⚠️  部分文件预编译失败(不影响运行,启动时会按需编译)")
+
+
 def create_readme():
     """创建打包说明文件"""
     readme_content = """# AI小说创作工具 Pro - 使用说明
@@ -194,8 +217,14 @@ def main():
     print("彻底解决safehttpx等第三方库的打包问题")
     print("=" * 60 + "\n")
 
+    # --skip-clean: 保留 build/ 和 PyInstaller 缓存,只重新打包有变化的部分(开发调试用)
+    skip_clean = "--skip-clean" in sys.argv[1:]
+
     # 清理旧文件
-    clean_build_dirs()
+    if skip_clean:
+        print("跳过清理,使用增量打包\n")
+    else:
+        clean_build_dirs()
 
     # 安装依赖
     install_dependencies()
@@ -203,19 +232,13 @@ def main():
     # 检查safehttpx
     check_safehttpx()
 
-    # 选择打包模式
-    print("请选择打包模式:")
-    print("1. 便携版(文件夹形式,启动快,推荐)")
-    print("2. 单文件版(单个exe,体积大,启动慢)")
-
-    choice = input("\n请输入选择 (1/2,默认1): ").strip()
-
-    portable = choice != "2"
-
-    # 开始打包
-    success = build_with_fixed_spec(portable=portable)
+    # 开始打包(仅便携版)
+    success = build_with_fixed_spec(clean=not skip_clean)
 
     if success:
+        # 预编译以源码形式收集的模块
+        precompile_bundle()
+
         # 创建使用说明
         create_readme()
 
@@ -20,11 +20,14 @@ if os.path.exists('templates'):
 
 # 2. safehttpx - 关键修复!
 # safehttpx需要version.txt文件,这是错误的根源
+# 打包时找到version.txt就直接放进包里,运行时无需再用钩子检查/补写
+safehttpx_version_bundled = False
 try:
     pkg_base, pkg_dir = get_package_paths('safehttpx')
     version_file = os.path.join(pkg_dir, 'version.txt')
     if os.path.exists(version_file):
         datas.append((version_file, 'safehttpx'))
+        safehttpx_version_bundled = True
         print(f"[Hook] Found safehttpx version.txt: {version_file}")
     else:
         print(f"[Hook] Warning: safehttpx version.txt not found at {version_file}")
@@ -181,7 +184,8 @@ a = Analysis(
     hiddenimports=hiddenimports,
     hookspath=['./'],  # 使用当前目录的hooks
     hooksconfig={},
-    runtime_hooks=['rthook-safehttpx.py'],  # 运行时钩子修复safehttpx
+    # 仅在打包时未找到version.txt时才需要运行时钩子修复safehttpx
+    runtime_hooks=[] if safehttpx_version_bundled else ['rthook-safehttpx.py'],
     excludes=[
         'matplotlib',
         'scipy',
@@ -195,8 +199,10 @@ a = Analysis(
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
     cipher=block_cipher,
-    noarchive=False,
-    optimize=0,
+    # 不打包进压缩的PYZ归档，.pyc以普通文件存放，启动时无需逐个解压（便携版体积略增）
+    noarchive=True,
+    # 以 -O 级别编译字节码(去掉assert)；不用 -OO，部分第三方库运行时依赖文档字符串
+    optimize=1,
 )
 
 # =============== 去重和优化 ===============
@@ -212,7 +218,7 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    upx=False,  # 不用UPX压缩，避免每次启动解压DLL及杀毒软件误报
     console=False,  # 不显示控制台窗口
     disable_windowed_traceback=False,
     argv_emulation=False,
@@ -228,7 +234,7 @@ coll = COLLECT(
     a.binaries,
     a.datas,
     strip=False,
-    upx=True,
+    upx=False,
     upx_exclude=[],
     name='AI小说创作工具Pro',
 )
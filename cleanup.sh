@@ -42,6 +42,12 @@ if [ -f "config/novel_tool_config.json" ]; then
     echo "清理临时配置文件完成"
 fi
 
+# 清理API密钥文件（与主配置文件配套）
+if [ -f "config/.secrets" ]; then
+    rm -f config/.secrets
+    echo "清理API密钥文件完成"
+fi
+
 # 清理开发文档文件
 rm -f *.md
 rm -f *.txt
@@ -4,14 +4,19 @@
 版权所有 © 2026 新疆幻城网安科技有限责任公司 (幻城科技)
 作者：幻城
 """
+import copy
 import json
-import yaml
 import os
-from typing import List, Dict, Any, Optional, Union
-from dataclasses import dataclass, asdict
+from typing import List, Dict, Any, Mapping, Optional, Union
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from types import MappingProxyType
 import hashlib
 import logging
+import shutil
+import threading
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +27,15 @@ BACKUP_DIR = os.path.join(CONFIG_DIR, "backups")
 SECRETS_FILE = os.path.join(CONFIG_DIR, ".secrets")
 
 os.makedirs(CONFIG_DIR, exist_ok=True)
-os.makedirs(BACKUP_DIR, exist_ok=True)
+
+# 主配置文件中API Key的引用前缀（实际密钥保存在 SECRETS_FILE 中）
+SECRET_REF_PREFIX = "ref::"
+
+# 保留的配置备份数量（仅在配置内容变化时备份）
+MAX_CONFIG_BACKUPS = 10
+
+# 两次配置备份的最小间隔（秒），连续修改设置时不会用大量备份挤掉较早的备份
+CONFIG_BACKUP_INTERVAL = 60
 
 # 限制最大文件大小 (50MB)
 MAX_FILE_SIZE = 50 * 1024 * 1024
@@ -218,6 +231,100 @@ API_PROVIDERS = {
     }
 }
 
+# 提供商配置为只读视图，get_api_providers/get_api_provider_info 直接返回共享对象而无需复制
+API_PROVIDERS = MappingProxyType({key: MappingProxyType(info) for key, info in API_PROVIDERS.items()})
+
+
+# API_PROVIDERS 的名称反向索引和下拉选项（提供商名称唯一）
+_PROVIDER_NAME_TO_KEY = {provider["name"]: key for key, provider in API_PROVIDERS.items()}
+_PROVIDER_CHOICES = tuple(provider["name"] for provider in API_PROVIDERS.values())
+
+# 后端配置校验用常量
+BACKEND_TYPES = frozenset({"ollama", "openai", "claude", "other"})
+URL_PREFIXES = ("http://", "https://")
+
+# to_dict() 中的固定配置项（运行期间不会变化，只构建一次）
+STATIC_CONFIG_SECTIONS = {
+    "system": {
+        "logging": {
+            "level": "INFO",
+            "file": "logs/novel_generator.log",
+            "console_output": True
+        },
+        "concurrency": {
+            "max_workers": 4,
+            "request_timeout": 30
+        },
+        "cache": {
+            "enabled": True,
+            "type": "file",
+            "location": "cache",
+            "ttl": 3600
+        }
+    },
+    "export": {
+        "default_format": "markdown",
+        "output_directory": "output",
+        "supported_formats": ["markdown", "pdf", "docx", "txt", "epub"]
+    },
+    "ui": {
+        "theme": "light",
+        "language": "zh-CN",
+        "editor": {
+            "font_size": 14,
+            "font_family": "Microsoft YaHei, sans-serif",
+            "tab_size": 2,
+            "word_wrap": True
+        }
+    },
+    "project": {
+        "auto_save": {
+            "enabled": True,
+            "interval": 300,
+            "backup_count": 5
+        },
+        "backup": {
+            "enabled": True,
+            "location": "backups",
+            "schedule": "daily",
+            "keep_days": 30
+        },
+        "templates": {
+            "enabled": True,
+            "location": "project_templates",
+            "default_template": "standard_novel"
+        }
+    },
+    "plugins": {
+        "enabled": True,
+        "directory": "plugins",
+        "auto_load": True,
+        "enabled_plugins": [
+            "style_analyzer",
+            "grammar_checker",
+            "character_tracker",
+            "plot_generator"
+        ]
+    },
+    "advanced": {
+        "performance": {
+            "enable_profiling": False,
+            "memory_limit": "1GB",
+            "cpu_limit": 80
+        },
+        "debug": {
+            "show_errors": False,
+            "debug_mode": False,
+            "trace_requests": False
+        },
+        "monitoring": {
+            "enabled": False,
+            "metrics_port": 8080,
+            "health_check_interval": 30
+        }
+    }
+}
+
 
 @dataclass
 class Backend:
@@ -235,9 +342,9 @@ class Backend:
         """验证配置的有效性"""
         if not self.name or not self.name.strip():
             return False, "后端名称不能为空"
-        if self.type not in ["ollama", "openai", "claude", "other"]:
+        if self.type not in BACKEND_TYPES:
             return False, f"不支持的类型: {self.type}"
-        if not self.base_url or not self.base_url.strip().startswith(("http://", "https://")):
+        if not self.base_url or not self.base_url.strip().startswith(URL_PREFIXES):
             return False, "Base URL必须以http或https开头"
         # ollama类型允许api_key为空
         if self.type != "ollama" and (not self.api_key or not self.api_key.strip()):
@@ -250,6 +357,19 @@ class Backend:
             return False, "重试次数必须在1-10之间"
         return True, "OK"
 
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "name": self.name,
+            "type": self.type,
+            "base_url": self.base_url,
+            "api_key": self.api_key,
+            "model": self.model,
+            "enabled": self.enabled,
+            "timeout": self.timeout,
+            "retry_times": self.retry_times
+        }
+
 
 @dataclass
 class GenerationConfig:
@@ -263,6 +383,7 @@ class GenerationConfig:
     writing_tone: str = "中性"
     character_development: str = "详细"
     plot_complexity: str = "中等"
+    deterministic_cache: bool = False  # 确定性模式：相同输入的重写/润色/续写直接复用缓存结果
     
     def validate(self) -> tuple[bool, str]:
         """验证参数的有效性"""
@@ -276,39 +397,155 @@ class GenerationConfig:
             return False, "章节目标字数必须在500-65536之间"
         return True, "OK"
 
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典"""
+        return {
+            "temperature": self.temperature,
+            "top_p": self.top_p,
+            "top_k": self.top_k,
+            "max_tokens": self.max_tokens,
+            "chapter_target_words": self.chapter_target_words,
+            "writing_style": self.writing_style,
+            "writing_tone": self.writing_tone,
+            "character_development": self.character_development,
+            "plot_complexity": self.plot_complexity,
+            "deterministic_cache": self.deterministic_cache
+        }
+
+
+def _config_file_key() -> Optional[tuple]:
+    """配置文件的 (修改时间, 大小)，文件不存在时返回 None"""
+    try:
+        stat = os.stat(CONFIG_FILE)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _secret_ref(api_key: str) -> str:
+    """API Key 在主配置文件中的引用标记"""
+    return SECRET_REF_PREFIX + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+def _read_secrets() -> Dict[str, str]:
+    """读取密钥文件 {引用标记: API Key}，不存在或损坏时返回空字典"""
+    if not os.path.exists(SECRETS_FILE):
+        return {}
+    try:
+        with open(SECRETS_FILE, "r", encoding="utf-8") as f:
+            secrets = json.load(f)
+        return secrets if isinstance(secrets, dict) else {}
+    except Exception as e:
+        logger.error(f"读取密钥文件失败: {e}")
+        return {}
+
+
+def _preserve_corrupt_secrets() -> None:
+    """密钥文件无法解析时先另存一份，避免被新写入的密钥文件覆盖后无法手动恢复"""
+    try:
+        with open(SECRETS_FILE, "r", encoding="utf-8") as f:
+            if isinstance(json.load(f), dict):
+                return
+    except FileNotFoundError:
+        return
+    except Exception:
+        pass
+    corrupt_file = f"{SECRETS_FILE}.corrupt_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    shutil.copyfile(SECRETS_FILE, corrupt_file)
+    logger.warning(f"密钥文件已损坏，原文件另存为 {corrupt_file}")
+
+
+def _backup_secret_refs() -> set:
+    """配置备份中仍在使用的API Key引用标记（恢复备份时需要对应的密钥）"""
+    refs = set()
+    if not os.path.isdir(BACKUP_DIR):
+        return refs
+    for name in os.listdir(BACKUP_DIR):
+        if not (name.startswith("backup_") and name.endswith(".json")):
+            continue
+        try:
+            with open(os.path.join(BACKUP_DIR, name), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for backend_data in data.get("backends", []):
+                api_key = backend_data.get("api_key")
+                if isinstance(api_key, str) and api_key.startswith(SECRET_REF_PREFIX):
+                    refs.add(api_key)
+        except Exception as e:
+            logger.debug(f"读取配置备份失败 {name}: {e}")
+    return refs
+
+
+@lru_cache(maxsize=1)
+def _parse_config_file(path: str, file_key: tuple) -> Dict[str, Any]:
+    """解析配置文件，文件未变化时复用上次结果（调用方不得修改返回值）"""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+# 保护单例的创建和首次加载（Gradio 线程池中可能有多个请求同时首次访问配置）
+_SINGLETON_LOCK = threading.Lock()
+
 
 class ConfigManager:
-    """配置管理器 - 单例模式"""
+    """配置管理器 - 单例模式（线程安全）"""
     _instance: Optional["ConfigManager"] = None
     
     def __new__(cls) -> "ConfigManager":
         if cls._instance is None:
-            cls._instance = super().__new__(cls)
-            cls._instance._initialized = False
+            with _SINGLETON_LOCK:
+                if cls._instance is None:
+                    instance = super().__new__(cls)
+                    instance._initialized = False
+                    cls._instance = instance
         return cls._instance
     
     def __init__(self):
         if self._initialized:
             return
         
-        self.backends: List[Backend] = []
-        self.generation: GenerationConfig = GenerationConfig()
-        self.version: str = "4.0.0"
-        self.last_modified: str = datetime.now().isoformat()
-        self._load()
-        self._initialized = True
+        with _SINGLETON_LOCK:
+            if self._initialized:
+                return
+
+            self.backends: List[Backend] = []
+            self.generation: GenerationConfig = GenerationConfig()
+            self.version: str = "4.0.0"
+            self.last_modified: str = datetime.now().isoformat()
+            self._file_key: Optional[tuple] = None  # 最近一次加载/保存时配置文件的 (修改时间, 大小)
+            self._content_hash: Optional[str] = None  # 最近一次加载/保存的配置内容哈希（不含修改时间）
+            self._secret_refs: Optional[frozenset] = None  # 密钥文件中已保存的引用标记
+            self._unresolved_backends: List[Dict[str, Any]] = []  # 密钥文件中找不到API Key的后端（原样保存）
+            self._enabled_cache: Optional[List[Backend]] = None  # 启用后端列表缓存，后端变化时失效
+            self._backends_by_name: Optional[Dict[str, Backend]] = None  # 后端名称索引，后端变化时失效
+            self._last_backup_time: Optional[float] = None  # 最近一次备份的时间（time.monotonic）
+            self._save_lock = threading.RLock()  # 串行化保存/重新加载，避免并发写入配置文件
+            self._load()
+            self._initialized = True
     
     def _load(self) -> None:
         """从磁盘加载配置"""
         try:
-            if os.path.exists(CONFIG_FILE):
-                with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                    data = json.load(f)
+            file_key = _config_file_key()
+            if file_key is not None:
+                data = _parse_config_file(CONFIG_FILE, file_key)
                 
-                # 加载后端配置
+                # 加载后端配置（API Key 为引用标记时从密钥文件还原）
                 if "backends" in data and isinstance(data["backends"], list):
+                    secrets = None
                     for backend_data in data["backends"]:
                         try:
+                            api_key = backend_data.get("api_key", "")
+                            if isinstance(api_key, str) and api_key.startswith(SECRET_REF_PREFIX):
+                                if secrets is None:
+                                    secrets = _read_secrets()
+                                    self._secret_refs = frozenset(secrets)
+                                if api_key not in secrets:
+                                    # 密钥文件缺失或损坏时不能当作无效后端丢弃，否则下次保存会把它从配置中删除
+                                    logger.warning(f"密钥文件中缺少后端 {backend_data.get('name')} 的API Key，"
+                                                   f"该后端暂不可用，配置中保留原记录")
+                                    self._unresolved_backends.append(dict(backend_data))
+                                    continue
+                                backend_data = {**backend_data, "api_key": secrets[api_key]}
                             backend = Backend(**backend_data)
                             valid, msg = backend.validate()
                             if valid:
@@ -329,6 +566,8 @@ class ConfigManager:
                 
                 self.version = data.get("version", "4.0.0")
                 self.last_modified = data.get("last_modified", datetime.now().isoformat())
+                self._file_key = file_key
+                self._content_hash = self._hash_content(self._content_data())
                 logger.info("配置加载成功")
             else:
                 logger.info("配置文件不存在，使用默认配置")
@@ -337,8 +576,30 @@ class ConfigManager:
             logger.error(f"加载配置失败: {e}")
             self._init_default()
     
+    def reload(self) -> tuple[bool, str]:
+        """重新从磁盘加载配置（外部修改配置文件后使用）"""
+        with self._save_lock:
+            file_key = _config_file_key()
+            if file_key is not None:
+                # 文件自上次加载/保存后未变化，无需重建配置
+                if file_key == self._file_key:
+                    return True, "配置文件未变化"
+                # 先确认文件可解析，避免损坏的文件导致配置被重置为默认值（解析结果会被 _load 复用）
+                try:
+                    _parse_config_file(CONFIG_FILE, file_key)
+                except Exception as e:
+                    logger.error(f"重新加载配置失败: {e}")
+                    return False, f"重新加载配置失败: {str(e)}"
+
+            self.backends = []
+            self._unresolved_backends = []
+            self.generation = GenerationConfig()
+            self._invalidate_backend_caches()
+            self._load()
+            return True, "配置已重新加载"
+    
     def _init_default(self) -> None:
-        """初始化默认配置"""
+        """初始化默认配置（仅在内存中，用户修改配置时才会写入磁盘）"""
         self.backends = [
             Backend(
                 name="本地Ollama",
@@ -349,36 +610,154 @@ class ConfigManager:
             )
         ]
         self.generation = GenerationConfig()
-        self.save()
     
-    def save(self) -> tuple[bool, str]:
-        """保存配置到磁盘"""
+    def _invalidate_backend_caches(self) -> None:
+        """后端列表或后端属性变化后，清除启用列表和名称索引缓存"""
+        self._enabled_cache = None
+        self._backends_by_name = None
+
+    def get_backend(self, name: str) -> Optional[Backend]:
+        """按名称查找后端（名称重复时返回第一个）"""
+        index = self._backends_by_name
+        if index is None:
+            index = {}
+            for backend in self.backends:
+                index.setdefault(backend.name, backend)
+            self._backends_by_name = index
+        return index.get(name)
+
+    def _content_data(self) -> Dict[str, Any]:
+        """需要持久化的配置内容（不含修改时间）"""
+        return {
+            "version": self.version,
+            "backends": [b.to_dict() for b in self.backends],
+            "generation": self.generation.to_dict(),
+        }
+
+    @staticmethod
+    def _hash_content(content: Dict[str, Any]) -> str:
+        """配置内容哈希，用于跳过内容未变化的保存"""
+        return hashlib.blake2b(
+            json.dumps(content, ensure_ascii=False, sort_keys=True).encode("utf-8"),
+            digest_size=16
+        ).hexdigest()
+
+    def _backup_config_file(self) -> None:
+        """备份当前配置文件，并只保留最近 MAX_CONFIG_BACKUPS 个备份"""
+        backup_name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        backup_path = os.path.join(BACKUP_DIR, backup_name)
+        # 备份目录在首次备份时才创建，首次保存配置前不会备份
+        os.makedirs(BACKUP_DIR, exist_ok=True)
+        # 必须复制而不是硬链接：配置文件支持手动编辑（见 reload），原地保存的编辑器会连同备份一起改写
+        shutil.copy2(CONFIG_FILE, backup_path)
+
+        backups = sorted(
+            name for name in os.listdir(BACKUP_DIR)
+            if name.startswith("backup_") and name.endswith(".json")
+        )
+        for name in backups[:-MAX_CONFIG_BACKUPS]:
+            try:
+                os.remove(os.path.join(BACKUP_DIR, name))
+            except OSError as e:
+                logger.debug(f"删除旧配置备份失败 {name}: {e}")
+
+    def _sync_secrets(self, secrets: Dict[str, str]) -> None:
+        """
+        更新密钥文件：写入当前后端的密钥，并保留配置备份和未还原后端仍引用的旧密钥
+        （主配置及其备份中只有引用标记，删掉这些密钥会导致恢复备份后无法使用）
+        """
+        if self._secret_refs is not None and secrets.keys() == self._secret_refs:
+            return
+        keep_refs = _backup_secret_refs()
+        keep_refs.update(b.get("api_key") for b in self._unresolved_backends)
+        merged = {ref: key for ref, key in _read_secrets().items() if ref in keep_refs}
+        merged.update(secrets)
+        if self._secret_refs is not None and merged.keys() == self._secret_refs:
+            return
+        self._write_secrets(merged)
+
+    def _write_secrets(self, secrets: Dict[str, str]) -> None:
+        """写入密钥文件（先写临时文件再原子替换）"""
+        _preserve_corrupt_secrets()
+        tmp_file = SECRETS_FILE + ".tmp"
+        with open(tmp_file, "w", encoding="utf-8") as f:
+            f.write(json.dumps(secrets, ensure_ascii=False, indent=4))
+            f.flush()
+            os.fsync(f.fileno())
         try:
-            # 创建备份
-            if os.path.exists(CONFIG_FILE):
-                backup_name = f"backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                backup_path = os.path.join(BACKUP_DIR, backup_name)
-                with open(CONFIG_FILE, "r", encoding="utf-8") as f:
-                    backup_data = f.read()
-                with open(backup_path, "w", encoding="utf-8") as f:
-                    f.write(backup_data)
+            os.chmod(tmp_file, 0o600)
+        except OSError:
+            pass
+        os.replace(tmp_file, SECRETS_FILE)
+        self._secret_refs = frozenset(secrets)
+
+    def save(self) -> tuple[bool, str]:
+        """保存配置到磁盘（内容未变化时跳过；先写临时文件再原子替换）"""
+        with self._save_lock:
+            # 后端列表或启用状态可能已被直接修改（如 config_api），保存前使缓存失效
+            self._invalidate_backend_caches()
+            tmp_file = CONFIG_FILE + ".tmp"
+            try:
+                content = self._content_data()
+                content_hash = self._hash_content(content)
+                if content_hash == self._content_hash and os.path.exists(CONFIG_FILE):
+                    logger.debug("配置内容未变化，跳过保存")
+                    return True, "配置保存成功"
+
+                # 创建备份（距上次备份不足 CONFIG_BACKUP_INTERVAL 秒时跳过）
+                now = time.monotonic()
+                if os.path.exists(CONFIG_FILE) and (
+                        self._last_backup_time is None
+                        or now - self._last_backup_time >= CONFIG_BACKUP_INTERVAL):
+                    self._backup_config_file()
+                    self._last_backup_time = now
             
-            # 保存当前配置
-            data = {
-                "version": self.version,
-                "last_modified": datetime.now().isoformat(),
-                "backends": [asdict(b) for b in self.backends],
-                "generation": asdict(self.generation),
-            }
+                # 保存当前配置
+                # API Key 只在主配置中保留引用标记，密钥本身仅在变化时写入密钥文件
+                secrets = {}
+                backends = []
+                for backend_data in content["backends"]:
+                    api_key = backend_data["api_key"]
+                    if api_key:
+                        ref = _secret_ref(api_key)
+                        secrets[ref] = api_key
+                        backend_data = {**backend_data, "api_key": ref}
+                    backends.append(backend_data)
+                # 找不到密钥的后端原样写回（不覆盖用户已重新添加的同名后端）
+                names = {b["name"] for b in backends}
+                self._unresolved_backends = [
+                    b for b in self._unresolved_backends if b.get("name") not in names
+                ]
+                backends.extend(self._unresolved_backends)
+                self._sync_secrets(secrets)
+
+                data = {
+                    "version": self.version,
+                    "last_modified": datetime.now().isoformat(),
+                    "backends": backends,
+                    "generation": content["generation"],
+                }
             
-            with open(CONFIG_FILE, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+                # 先整体序列化再一次写入（json.dump 带缩进时会逐个片段调用 write）
+                text = json.dumps(data, ensure_ascii=False, indent=4)
+                with open(tmp_file, "w", encoding="utf-8") as f:
+                    f.write(text)
+                    # 先落盘再替换，断电时不会留下已替换但内容为空的配置文件
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_file, CONFIG_FILE)
+                self._file_key = _config_file_key()
+                self._content_hash = content_hash
             
-            logger.info("配置保存成功")
-            return True, "配置保存成功"
-        except Exception as e:
-            logger.error(f"保存配置失败: {e}")
-            return False, f"保存配置失败: {str(e)}"
+                logger.info("配置保存成功")
+                return True, "配置保存成功"
+            except Exception as e:
+                try:
+                    os.remove(tmp_file)
+                except OSError:
+                    pass
+                logger.error(f"保存配置失败: {e}")
+                return False, f"保存配置失败: {str(e)}"
     
     def add_backend(self, backend: Backend) -> tuple[bool, str]:
         """添加后端"""
@@ -387,39 +766,49 @@ class ConfigManager:
             return False, msg
         
         # 检查重复
-        if any(b.name == backend.name for b in self.backends):
+        if self.get_backend(backend.name) is not None:
             return False, f"后端'{backend.name}'已存在"
         
         self.backends.append(backend)
+        self._invalidate_backend_caches()
         success, msg = self.save()
         return success, msg if not success else "后端添加成功"
     
     def update_backend(self, name: str, **kwargs) -> tuple[bool, str]:
         """更新后端配置"""
-        for backend in self.backends:
-            if backend.name == name:
-                for key, value in kwargs.items():
-                    if hasattr(backend, key):
-                        setattr(backend, key, value)
-                
-                valid, msg = backend.validate()
-                if not valid:
-                    return False, msg
-                
-                success, msg = self.save()
-                return success, msg if not success else "后端更新成功"
+        backend = self.get_backend(name)
+        if backend is None:
+            return False, f"后端'{name}'不存在"
+
+        for key, value in kwargs.items():
+            if hasattr(backend, key):
+                setattr(backend, key, value)
+        self._invalidate_backend_caches()
         
-        return False, f"后端'{name}'不存在"
+        valid, msg = backend.validate()
+        if not valid:
+            return False, msg
+        
+        success, msg = self.save()
+        return success, msg if not success else "后端更新成功"
     
     def delete_backend(self, name: str) -> tuple[bool, str]:
         """删除后端"""
+        # 名称不存在时直接返回，不重建列表也不写盘
+        if self.get_backend(name) is None:
+            return False, f"后端'{name}'不存在"
         self.backends = [b for b in self.backends if b.name != name]
+        self._invalidate_backend_caches()
         success, msg = self.save()
         return success, msg if not success else f"后端'{name}'已删除"
     
     def get_enabled_backends(self) -> List[Backend]:
-        """获取所有启用的后端"""
-        return [b for b in self.backends if b.enabled]
+        """获取所有启用的后端（返回缓存列表，调用方不要修改）"""
+        enabled = self._enabled_cache
+        if enabled is None:
+            enabled = [b for b in self.backends if b.enabled]
+            self._enabled_cache = enabled
+        return enabled
     
     def update_generation_config(self, **kwargs) -> tuple[bool, str]:
         """更新生成配置"""
@@ -441,123 +830,92 @@ class ConfigManager:
                 "version": self.version,
                 "backends": [{"name": b.name, "type": b.type, "model": b.model} 
                             for b in self.backends],
-                "generation": asdict(self.generation),
+                "generation": self.generation.to_dict(),
             }
             
             with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, ensure_ascii=False, indent=4)
+                f.write(json.dumps(data, ensure_ascii=False, indent=4))
             
             return True, f"配置已导出至 {filepath}"
         except Exception as e:
             return False, f"导出配置失败: {str(e)}"
     
     def to_dict(self) -> Dict[str, Any]:
-        """将配置转换为字典格式"""
+        """将配置转换为字典格式（静态部分为共享的模块常量，调用方不要修改）"""
         return {
-            "backends": [asdict(b) for b in self.backends],
-            "generation": asdict(self.generation),
-            "system": {
-                "logging": {
-                    "level": "INFO",
-                    "file": "logs/novel_generator.log",
-                    "console_output": True
-                },
-                "concurrency": {
-                    "max_workers": 4,
-                    "request_timeout": 30
-                },
-                "cache": {
-                    "enabled": True,
-                    "type": "file",
-                    "location": "cache",
-                    "ttl": 3600
-                }
-            },
-            "export": {
-                "default_format": "markdown",
-                "output_directory": "output",
-                "supported_formats": ["markdown", "pdf", "docx", "txt", "epub"]
-            },
-            "ui": {
-                "theme": "light",
-                "language": "zh-CN",
-                "editor": {
-                    "font_size": 14,
-                    "font_family": "Microsoft YaHei, sans-serif",
-                    "tab_size": 2,
-                    "word_wrap": True
-                }
-            },
-            "project": {
-                "auto_save": {
-                    "enabled": True,
-                    "interval": 300,
-                    "backup_count": 5
-                },
-                "backup": {
-                    "enabled": True,
-                    "location": "backups",
-                    "schedule": "daily",
-                    "keep_days": 30
-                },
-                "templates": {
-                    "enabled": True,
-                    "location": "project_templates",
-                    "default_template": "standard_novel"
-                }
-            },
-            "plugins": {
-                "enabled": True,
-                "directory": "plugins",
-                "auto_load": True,
-                "enabled_plugins": [
-                    "style_analyzer",
-                    "grammar_checker",
-                    "character_tracker",
-                    "plot_generator"
-                ]
-            },
-            "advanced": {
-                "performance": {
-                    "enable_profiling": False,
-                    "memory_limit": "1GB",
-                    "cpu_limit": 80
-                },
-                "debug": {
-                    "show_errors": False,
-                    "debug_mode": False,
-                    "trace_requests": False
-                },
-                "monitoring": {
-                    "enabled": False,
-                    "metrics_port": 8080,
-                    "health_check_interval": 30
-                }
-            }
+            "backends": [b.to_dict() for b in self.backends],
+            "generation": self.generation.to_dict(),
+            **STATIC_CONFIG_SECTIONS
         }
     
     @staticmethod
-    def get_api_providers() -> Dict[str, Dict[str, Any]]:
-        """获取所有API提供商配置"""
+    def get_api_providers() -> Mapping[str, Mapping[str, Any]]:
+        """获取所有API提供商配置（只读）"""
         return API_PROVIDERS
     
     @staticmethod
     def get_api_provider_choices() -> List[str]:
         """获取API提供商选择列表"""
-        return [provider["name"] for provider in API_PROVIDERS.values()]
+        return list(_PROVIDER_CHOICES)
     
     @staticmethod
-    def get_api_provider_info(provider_key: str) -> Optional[Dict[str, Any]]:
-        """根据提供商键获取提供商信息"""
+    def get_api_provider_info(provider_key: str) -> Optional[Mapping[str, Any]]:
+        """根据提供商键获取提供商信息（只读）"""
         return API_PROVIDERS.get(provider_key)
     
     @staticmethod
     def get_api_provider_key_by_name(provider_name: str) -> Optional[str]:
         """根据提供商名称获取提供商键"""
-        for key, provider in API_PROVIDERS.items():
-            if provider["name"] == provider_name:
-                return key
-        return None
+        return _PROVIDER_NAME_TO_KEY.get(provider_name)
+
+
+def _load_yaml_file(path: str) -> Dict[str, Any]:
+    """读取YAML配置文件（PyYAML为可选依赖，仅在实际读取YAML时导入）"""
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError("读取YAML配置需要PyYAML依赖，请运行: pip install PyYAML")
+
+    # 优先使用 libyaml 的C解析器，PyYAML 未编译 libyaml 时退回纯Python实现
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, "rb") as f:
+        return yaml.load(f.read(), Loader=loader)
+
+
+# load_config 的解析缓存 {路径: (修改时间, 大小, 解析结果)}
+_LOAD_CONFIG_CACHE: Dict[str, tuple] = {}
+_LOAD_CONFIG_CACHE_LOCK = threading.Lock()
+
+
+def clear_config_cache() -> None:
+    """清空 load_config 的解析缓存"""
+    with _LOAD_CONFIG_CACHE_LOCK:
+        _LOAD_CONFIG_CACHE.clear()
+
+
+def _load_config_file(path: str) -> Dict[str, Any]:
+    """按扩展名解析配置文件，文件未变化（修改时间和大小相同）时直接复用缓存"""
+    file_ext = os.path.splitext(path)[1].lower()
+    if file_ext not in SUPPORTED_CONFIG_FORMATS:
+        raise ValueError(f"不支持的配置文件格式: {file_ext}")
+
+    stat = os.stat(path)
+    key = os.path.abspath(path)
+    with _LOAD_CONFIG_CACHE_LOCK:
+        cached = _LOAD_CONFIG_CACHE.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        data = cached[2]
+    else:
+        if file_ext == ".json":
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        else:
+            data = _load_yaml_file(path)
+        with _LOAD_CONFIG_CACHE_LOCK:
+            _LOAD_CONFIG_CACHE[key] = (stat.st_mtime_ns, stat.st_size, data)
+
+    # 返回副本，调用方修改结果不会污染缓存
+    return copy.deepcopy(data)
 
 
 def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
@@ -579,15 +937,7 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
         if not os.path.exists(config_path):
             raise FileNotFoundError(f"配置文件不存在: {config_path}")
             
-        file_ext = os.path.splitext(config_path)[1].lower()
-        if file_ext == ".json":
-            with open(config_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        elif file_ext in [".yaml", ".yml"]:
-            with open(config_path, "r", encoding="utf-8") as f:
-                return yaml.safe_load(f)
-        else:
-            raise ValueError(f"不支持的配置文件格式: {file_ext}")
+        return _load_config_file(config_path)
     else:
         # 按优先级查找配置文件
         config_files = [
@@ -597,16 +947,10 @@ def load_config(config_path: Optional[str] = None) -> Dict[str, Any]:
         
         for config_file in config_files:
             if os.path.exists(config_file):
-                file_ext = os.path.splitext(config_file)[1].lower()
-                if file_ext == ".json":
-                    with open(config_file, "r", encoding="utf-8") as f:
-                        return json.load(f)
-                elif file_ext in [".yaml", ".yml"]:
-                    with open(config_file, "r", encoding="utf-8") as f:
-                        return yaml.safe_load(f)
+                return _load_config_file(config_file)
         
-        # 如果都没有找到，返回默认配置
-        return get_config().to_dict()
+        # 如果都没有找到，返回默认配置（to_dict 的静态部分是共享的模块常量，返回副本）
+        return copy.deepcopy(get_config().to_dict())
 
 def get_config() -> ConfigManager:
     """获取全局配置实例"""
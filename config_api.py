@@ -7,7 +7,6 @@ Web API 接口配置管理模块
 """
 import json
 from typing import Dict, List, Tuple, Any
-from dataclasses import asdict
 from config import Backend, get_config
 from api_client import get_api_client, reinit_api_client
 from logger import get_logger
@@ -18,15 +17,16 @@ logger = get_logger("ConfigAPI")
 class ConfigAPIManager:
     """配置管理API"""
     
+    @staticmethod
+    def _backends_data() -> List[Dict[str, Any]]:
+        """获取当前内存中的后端列表（字典形式）"""
+        return [backend.to_dict() for backend in get_config().backends]
+    
     @staticmethod
     def list_backends() -> Dict[str, Any]:
         """获取所有后端列表"""
         try:
-            config = get_config()
-            backends_data = []
-            for backend in config.backends:
-                backend_dict = asdict(backend)
-                backends_data.append(backend_dict)
+            backends_data = ConfigAPIManager._backends_data()
             return {
                 "success": True,
                 "data": backends_data,
@@ -49,12 +49,11 @@ class ConfigAPIManager:
             config = get_config()
             
             # 检查名称是否重复
-            for backend in config.backends:
-                if backend.name == name:
-                    return {
-                        "success": False,
-                        "message": f"后端名称 '{name}' 已存在，请使用不同的名称"
-                    }
+            if config.get_backend(name) is not None:
+                return {
+                    "success": False,
+                    "message": f"后端名称 '{name}' 已存在，请使用不同的名称"
+                }
             
             # 创建新的后端
             new_backend = Backend(
@@ -85,7 +84,8 @@ class ConfigAPIManager:
                 return {
                     "success": True,
                     "message": f"后端 '{name}' 添加成功",
-                    "backend": asdict(new_backend)
+                    "backend": new_backend.to_dict(),
+                    "data": ConfigAPIManager._backends_data()
                 }
             else:
                 return {
@@ -137,7 +137,8 @@ class ConfigAPIManager:
                 logger.info(f"成功删除后端: {name}")
                 return {
                     "success": True,
-                    "message": msg
+                    "message": msg,
+                    "data": ConfigAPIManager._backends_data()
                 }
             else:
                 return {
@@ -164,7 +165,8 @@ class ConfigAPIManager:
                 logger.info(f"已{status}后端: {name}")
                 return {
                     "success": True,
-                    "message": f"后端已{status}"
+                    "message": f"后端已{status}",
+                    "data": ConfigAPIManager._backends_data()
                 }
             else:
                 return {
@@ -184,13 +186,8 @@ class ConfigAPIManager:
         """测试后端连接"""
         try:
             config = get_config()
-            backend = None
-            
             # 查找指定的后端
-            for b in config.backends:
-                if b.name == name:
-                    backend = b
-                    break
+            backend = config.get_backend(name)
             
             if not backend:
                 return {
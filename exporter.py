@@ -17,13 +17,25 @@ logger = logging.getLogger(__name__)
 MODULE_ROOT = os.path.dirname(os.path.abspath(__file__))
 EXPORT_DIR = os.path.join(MODULE_ROOT, "exports")
 os.makedirs(EXPORT_DIR, exist_ok=True)
+# 导出临时文件的写缓冲：大文件按 1MB 成块写入，减少 write 系统调用
+EXPORT_WRITE_BUFFER = 1 << 20
+
+# 预编译的正则表达式
+_ILLEGAL_FILENAME_RE = re.compile(r'[<>:"/\\|?*]')
+# 章节标题行：可带 '#'~'######' 前缀，支持"第1章"、"第 1 章"等空格变体；分组1为标题文本
+_CHAPTER_HEADER_RE = re.compile(r'^\s*(?:#{1,6}\s*)?(第\s*\d+\s*章.*)')
+# 除 '#' 标题和普通段落外的 Markdown 语法（行内标记、HTML/实体、列表、引用、代码块、
+# 分隔线、行首行尾空白等），出现任意一种时交给 python-markdown 处理
+_MARKDOWN_SYNTAX_RE = re.compile(r'[*_`\[\]<>&\\\r\t]|^[ ]|[ ]$|^[-+=]|^\d+[.)]|^#{7}', re.MULTILINE)
+# 段落分隔：连续的空行（含只有空白的行）视为一个分隔（与 file_parser 一致）
+_PARAGRAPH_SPLIT_RE = re.compile(r'\n\s*\n+')
 
 
 def _sanitize_filename(name: str, max_len: int = 120) -> str:
     """清理文件名中的非法字符并限制长度"""
     if not name or not name.strip():
         name = "novel"
-    safe = re.sub(r'[<>:"/\\|?*]', '_', name).strip()
+    safe = _ILLEGAL_FILENAME_RE.sub('_', name).strip()
     if len(safe) > max_len:
         safe = safe[:max_len]
     return safe
@@ -40,9 +52,6 @@ def _extract_chapters_from_markdown(text: str) -> list:
     current_chapter = None
     content_lines = []
 
-    # 更通用的章节头检测，支持 '#', '##', '###' 等级别，支持中文与空格变体
-    header_re = re.compile(r'^(?:#{1,6}\s*)?(第\s*\d+\s*章[\s\S]*|第\s*\d+章[\s\S]*|第\s*\d+\s*章[:：\s\-—–]?.*)$', re.IGNORECASE)
-
     for line in text.splitlines():
         if not line:
             # 空行作为段落分隔符，但不要结束章节
@@ -50,16 +59,15 @@ def _extract_chapters_from_markdown(text: str) -> list:
                 content_lines.append('')
             continue
 
-        # 检测章节标题
-        if header_re.match(line.strip()):
+        # 检测章节标题（同一次匹配中取出标题文本）
+        header_match = _CHAPTER_HEADER_RE.match(line)
+        if header_match:
             # 保存上一章
             if current_chapter:
-                current_chapter['content'] = '\n'.join([l for l in content_lines]).strip()
+                current_chapter['content'] = '\n'.join(content_lines).strip()
                 chapters.append(current_chapter)
 
-            # 提取标题文本
-            title_match = re.search(r'(第\s*\d+\s*章[\s\S]*)', line)
-            title = title_match.group(1).strip() if title_match else line.strip()
+            title = header_match.group(1).strip()
             current_chapter = {'title': title, 'content': ''}
             content_lines = []
             continue
@@ -77,12 +85,47 @@ def _extract_chapters_from_markdown(text: str) -> list:
 
     # 保存最后一章
     if current_chapter:
-        current_chapter['content'] = '\n'.join([l for l in content_lines]).strip()
+        current_chapter['content'] = '\n'.join(content_lines).strip()
         chapters.append(current_chapter)
 
     return chapters
 
 
+def _fast_novel_to_html(text: str) -> Optional[str]:
+    """
+    将只包含 '#' 标题和普通段落的小说文本直接转换为HTML（输出与 markdown.markdown 相同）
+    
+    Returns:
+        HTML片段；文本含其他Markdown语法时返回 None
+    """
+    if _MARKDOWN_SYNTAX_RE.search(text):
+        return None
+
+    parts = []
+    para_lines = []
+
+    def flush_paragraph():
+        if para_lines:
+            paragraph = "\n".join(para_lines).lstrip()
+            if paragraph:
+                parts.append(f"<p>{paragraph}</p>")
+            para_lines.clear()
+
+    for line in text.split('\n'):
+        if line.startswith('#'):
+            flush_paragraph()
+            level = len(line) - len(line.lstrip('#'))
+            parts.append(f"<h{level}>{line[level:].rstrip('#').strip()}</h{level}>")
+        elif line:
+            para_lines.append(line)
+        else:
+            flush_paragraph()
+    flush_paragraph()
+
+    # 文本不含 < > &（见 _MARKDOWN_SYNTAX_RE），无需HTML转义
+    return '\n'.join(parts)
+
+
 def export_to_txt(novel_text: str, title: str) -> Tuple[Optional[str], str]:
     """
     导出为TXT格式
@@ -104,22 +147,20 @@ def export_to_txt(novel_text: str, title: str) -> Tuple[Optional[str], str]:
         if not chapters:
             return None, "无法从文本中提取章节"
         
-        # 生成TXT内容
-        txt_content = f"{title}\n\n"
-        
-        for chapter in chapters:
-            txt_content += f"{chapter['title']}\n\n"
-            txt_content += f"{chapter['content']}\n\n"
-            txt_content += "-" * 80 + "\n\n"
-        
-        # 保存文件（原子写入）
+        # 保存文件（原子写入；逐章直接写入临时文件，不在内存中拼出全文）
+        separator = "-" * 80 + "\n\n"
         safe_title = _sanitize_filename(title)
         filename = f"{safe_title}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
         filepath = os.path.join(EXPORT_DIR, filename)
         try:
-            with tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False, dir=EXPORT_DIR) as tmp:
-                tmp.write(txt_content)
+            with tempfile.NamedTemporaryFile('w', buffering=EXPORT_WRITE_BUFFER, encoding='utf-8',
+                                             delete=False, dir=EXPORT_DIR) as tmp:
                 tmp_path = tmp.name
+                tmp.write(f"{title}\n\n")
+                for chapter in chapters:
+                    tmp.write(f"{chapter['title']}\n\n")
+                    tmp.write(f"{chapter['content']}\n\n")
+                    tmp.write(separator)
             os.replace(tmp_path, filepath)
         except Exception as e:
             logger.error(f"写入TXT文件失败: {e}")
@@ -148,20 +189,22 @@ def export_to_markdown(novel_text: str, title: str) -> Tuple[Optional[str], str]
         if not novel_text.strip():
             return None, "无内容可导出"
         
+        # 内容中的生成时间与文件名使用同一时刻
+        now = datetime.now()
+
         # 添加元数据
-        md_content = f"# {title}\n\n"
-        md_content += f"*生成于: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
-        md_content += "---\n\n"
-        md_content += novel_text
+        md_header = f"# {title}\n\n*生成于: {now.strftime('%Y-%m-%d %H:%M:%S')}*\n\n---\n\n"
         
-        # 保存文件（原子写入）
+        # 保存文件（原子写入；元数据和正文分别写入，不复制整篇正文）
         safe_title = _sanitize_filename(title)
-        filename = f"{safe_title}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+        filename = f"{safe_title}_{now.strftime('%Y%m%d_%H%M%S')}.md"
         filepath = os.path.join(EXPORT_DIR, filename)
         try:
-            with tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False, dir=EXPORT_DIR) as tmp:
-                tmp.write(md_content)
+            with tempfile.NamedTemporaryFile('w', buffering=EXPORT_WRITE_BUFFER, encoding='utf-8',
+                                             delete=False, dir=EXPORT_DIR) as tmp:
                 tmp_path = tmp.name
+                tmp.write(md_header)
+                tmp.write(novel_text)
             os.replace(tmp_path, filepath)
         except Exception as e:
             logger.error(f"写入Markdown文件失败: {e}")
@@ -204,6 +247,12 @@ def export_to_docx(novel_text: str, title: str) -> Tuple[Optional[str], str]:
         if not chapters:
             return None, "无法从文本中提取章节"
         
+        now = datetime.now()
+
+        # 设置中文字体用的限定名，只生成一次（章节循环中每个 run 都会用到）
+        rfonts_tag = qn('w:rFonts')
+        east_asia_attr = qn('w:eastAsia')
+
         doc = Document()
         
         # 配置样式
@@ -214,7 +263,7 @@ def export_to_docx(novel_text: str, title: str) -> Tuple[Optional[str], str]:
         
         # 中文字体
         rPr = style.element.get_or_add_rPr()
-        rPr.find(qn('w:rFonts')).set(qn('w:eastAsia'), '宋体')
+        rPr.find(rfonts_tag).set(east_asia_attr, '宋体')
         
         # 段落格式
         style.paragraph_format.first_line_indent = Pt(24)
@@ -232,12 +281,12 @@ def export_to_docx(novel_text: str, title: str) -> Tuple[Optional[str], str]:
         
         # 中文字体设置
         title_rPr = title_run._element.get_or_add_rPr()
-        title_rPr.find(qn('w:rFonts')).set(qn('w:eastAsia'), '黑体')
+        title_rPr.find(rfonts_tag).set(east_asia_attr, '黑体')
         
         # 添加作者和日期信息
         info_para = doc.add_paragraph()
         info_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        info_run = info_para.add_run(f"生成日期：{datetime.now().strftime('%Y年%m月%d日')}")
+        info_run = info_para.add_run(f"生成日期：{now.strftime('%Y年%m月%d日')}")
         info_run.font.size = Pt(10)
         
         doc.add_paragraph()  # 空行
@@ -253,12 +302,12 @@ def export_to_docx(novel_text: str, title: str) -> Tuple[Optional[str], str]:
                 run.font.size = Pt(16)
                 run.font.bold = True
                 run_rPr = run._element.get_or_add_rPr()
-                run_rPr.find(qn('w:rFonts')).set(qn('w:eastAsia'), '黑体')
+                run_rPr.find(rfonts_tag).set(east_asia_attr, '黑体')
             
             doc.add_paragraph()  # 空行
             
             # 章节内容 - 按段落添加
-            paragraphs = chapter['content'].split('\n\n')
+            paragraphs = _PARAGRAPH_SPLIT_RE.split(chapter['content'])
             for para_text in paragraphs:
                 if para_text.strip():
                     p = doc.add_paragraph(para_text.strip(), style='Normal')
@@ -267,7 +316,7 @@ def export_to_docx(novel_text: str, title: str) -> Tuple[Optional[str], str]:
         
         # 保存文件（原子写入）
         safe_title = _sanitize_filename(title)
-        filename = f"{safe_title}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.docx"
+        filename = f"{safe_title}_{now.strftime('%Y%m%d_%H%M%S')}.docx"
         filepath = os.path.join(EXPORT_DIR, filename)
         try:
             tmp_fd, tmp_path = tempfile.mkstemp(suffix='.docx', dir=EXPORT_DIR)
@@ -297,20 +346,23 @@ def export_to_html(novel_text: str, title: str) -> Tuple[Optional[str], str]:
     Returns:
         (文件路径, 状态信息)
     """
-    try:
-        import markdown
-    except ImportError:
-        return None, "错误：缺少markdown依赖，请运行: pip install markdown"
-    
     try:
         if not novel_text.strip():
             return None, "无内容可导出"
         
-        # 转换Markdown为HTML
-        html_content = markdown.markdown(novel_text)
+        now = datetime.now()
+
+        # 转换Markdown为HTML（只有章节标题和段落时直接生成，否则使用 python-markdown）
+        html_content = _fast_novel_to_html(novel_text)
+        if html_content is None:
+            try:
+                import markdown
+            except ImportError:
+                return None, "错误：缺少markdown依赖，请运行: pip install markdown"
+            html_content = markdown.markdown(novel_text)
         
-        # 包裹为完整HTML文档
-        full_html = f"""<!DOCTYPE html>
+        # 包裹为完整HTML文档（正文单独写入，不再拼成完整字符串）
+        html_head = f"""<!DOCTYPE html>
 <html lang="zh-CN">
 <head>
     <meta charset="UTF-8">
@@ -353,20 +405,24 @@ def export_to_html(novel_text: str, title: str) -> Tuple[Optional[str], str]:
 </head>
 <body>
     <h1>{title}</h1>
-    <p class="info">生成于: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+    <p class="info">生成于: {now.strftime('%Y-%m-%d %H:%M:%S')}</p>
     <hr>
-    {html_content}
+    """
+        html_tail = """
 </body>
 </html>"""
         
         # 保存文件（原子写入）
         safe_title = _sanitize_filename(title)
-        filename = f"{safe_title}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
+        filename = f"{safe_title}_{now.strftime('%Y%m%d_%H%M%S')}.html"
         filepath = os.path.join(EXPORT_DIR, filename)
         try:
-            with tempfile.NamedTemporaryFile('w', encoding='utf-8', delete=False, dir=EXPORT_DIR) as tmp:
-                tmp.write(full_html)
+            with tempfile.NamedTemporaryFile('w', buffering=EXPORT_WRITE_BUFFER, encoding='utf-8',
+                                             delete=False, dir=EXPORT_DIR) as tmp:
                 tmp_path = tmp.name
+                tmp.write(html_head)
+                tmp.write(html_content)
+                tmp.write(html_tail)
             os.replace(tmp_path, filepath)
         except Exception as e:
             logger.error(f"写入HTML文件失败: {e}")
@@ -383,20 +439,23 @@ def export_to_html(novel_text: str, title: str) -> Tuple[Optional[str], str]:
 def list_export_files() -> list:
     """列出所有导出文件"""
     try:
-        files = []
-        for filename in os.listdir(EXPORT_DIR):
-            filepath = os.path.join(EXPORT_DIR, filename)
-            if os.path.isfile(filepath):
-                file_size = os.path.getsize(filepath)
-                file_time = datetime.fromtimestamp(os.path.getmtime(filepath))
-                files.append({
-                    'name': filename,
-                    'path': filepath,
-                    'size': file_size,
-                    'time': file_time.strftime('%Y-%m-%d %H:%M:%S')
-                })
+        # scandir 的目录项自带文件类型，每个文件只需一次 stat 即可取得大小和修改时间
+        entries = []
+        with os.scandir(EXPORT_DIR) as it:
+            for entry in it:
+                if entry.is_file():
+                    entries.append((entry, entry.stat()))
         
-        return sorted(files, key=lambda x: x['time'], reverse=True)
+        entries.sort(key=lambda item: item[1].st_mtime, reverse=True)
+        return [
+            {
+                'name': entry.name,
+                'path': entry.path,
+                'size': stat.st_size,
+                'time': datetime.fromtimestamp(stat.st_mtime).strftime('%Y-%m-%d %H:%M:%S')
+            }
+            for entry, stat in entries
+        ]
     
     except Exception as e:
         logger.error(f"列出导出文件失败: {e}")
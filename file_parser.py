@@ -4,19 +4,37 @@
 版权所有 © 2026 新疆幻城网安科技有限责任公司 (幻城科技)
 作者：幻城
 """
+import io
 import os
 import re
+import shutil
 import logging
 import tempfile
-from typing import Tuple, List, Optional, IO, Dict
+import contextlib
+import importlib.util
+from functools import lru_cache
+from typing import Tuple, List, Optional, IO, Dict, Pattern, Iterable, Iterator, Callable
 from enum import Enum
 from dataclasses import dataclass
 
 logger = logging.getLogger(__name__)
 
 # 常量
+# 解析/分段结果的版本号，修改会改变解析结果的逻辑时递增（使界面的文件解析缓存失效）
+PARSER_VERSION = 2
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 MIN_PARAGRAPH_LENGTH = 20  # 最小段落长度
+TXT_READ_CHUNK_CHARS = 256 * 1024  # TXT/MD 每次读取的字符数
+UPLOAD_COPY_BUFFER = 1024 * 1024  # 上传流写入临时文件时的复制块大小
+
+# 预编译的正则表达式
+_PARAGRAPH_SPLIT_RE = re.compile(r'\n\s*\n+')
+_CHAPTER_PREFIX_RE = re.compile(r'^(第\d+章|Chapter \d+|第 \d+ 章)[：:]?\s*')
+# _CHAPTER_PREFIX_RE 能匹配的段落必然以这些字面前缀开头，修改正则时需同步
+_CHAPTER_PREFIXES = ('第', 'Chapter ')
+_STAR_EDGE_RE = re.compile(r'^\s*\*+\s*|\s*\*+\s*$')
+_CHINESE_RUN_RE = re.compile(r'[\u4e00-\u9fff]+')
+_ENGLISH_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
 
 
 # 预设章节模板
@@ -47,6 +65,12 @@ CHAPTER_PATTERNS = {
     ],
 }
 
+# 预设模板在导入时合并为一个分支正则并编译，每行只需一次匹配
+_COMPILED_CHAPTER_PATTERNS = {
+    name: re.compile("|".join(f"(?:{pattern})" for pattern in patterns), re.IGNORECASE)
+    for name, patterns in CHAPTER_PATTERNS.items()
+}
+
 
 @dataclass
 class ChapterInfo:
@@ -89,13 +113,34 @@ def get_file_type(file_path: str) -> FileType:
         return FileType.UNKNOWN
 
 
-def parse_txt_file(file_path: str) -> Tuple[List[str], str]:
-    """
-    解析TXT文件
-    
-    Returns:
-        (段落列表, 状态信息)
-    """
+@lru_cache(maxsize=1)
+def _html_parser_name() -> str:
+    """EPUB章节使用的 BeautifulSoup 解析器：优先C实现的 lxml（python-docx 的依赖），否则用标准库 html.parser"""
+    return "lxml" if importlib.util.find_spec("lxml") is not None else "html.parser"
+
+
+def _read_text_paragraphs(stream: IO) -> Tuple[List[str], int]:
+    """按空行切分文本流为段落，返回 (段落列表, 不含换行符的字数)"""
+    newline_count = 0
+
+    def iter_chunks():
+        # 按块读取：解码和分段都在C中完成，也不需要把整个文件读入内存
+        nonlocal newline_count
+        while True:
+            chunk = stream.read(TXT_READ_CHUNK_CHARS)
+            if not chunk:
+                return
+            newline_count += chunk.count('\n')
+            yield chunk
+
+    paragraphs, total_chars = _split_paragraphs_streaming(
+        iter_chunks(), MIN_PARAGRAPH_LENGTH, clean=_strip_paragraphs
+    )
+    return paragraphs, total_chars - newline_count
+
+
+def _parse_plain_text_file(file_path: str, file_size: Optional[int], label: str) -> Tuple[List[str], str]:
+    """TXT/Markdown 共用的解析实现，label 用于日志"""
     try:
         # 支持传入文件对象或路径
         if hasattr(file_path, 'read'):
@@ -107,58 +152,37 @@ def parse_txt_file(file_path: str) -> Tuple[List[str], str]:
                 fobj.seek(0)
             except Exception:
                 file_size = 0
-        else:
+        elif file_size is None:
             file_size = os.path.getsize(file_path)
 
         if file_size and file_size > MAX_FILE_SIZE:
             return [], f"错误：文件过大 ({file_size / 1024 / 1024:.1f}MB > 50MB)"
 
-        paragraphs: List[str] = []
-        buf_lines: List[str] = []
-        total_chars = 0
-
-        # 逐行读取以降低内存压力
         if hasattr(file_path, 'read'):
-            stream = file_path
+            paragraphs, total_chars = _read_text_paragraphs(file_path)
         else:
-            stream = open(file_path, 'r', encoding='utf-8', errors='ignore')
-
-        try:
-            for line in stream:
-                stripped = line.rstrip('\n')
-                total_chars += len(stripped)
-
-                if stripped.strip() == '':
-                    # 空行 -> 段落结束
-                    if buf_lines:
-                        para = '\n'.join(buf_lines).strip()
-                        if len(para) >= MIN_PARAGRAPH_LENGTH:
-                            paragraphs.append(para)
-                        buf_lines = []
-                    continue
-
-                # 常规行
-                buf_lines.append(stripped)
-
-            # 最后一段
-            if buf_lines:
-                para = '\n'.join(buf_lines).strip()
-                if len(para) >= MIN_PARAGRAPH_LENGTH:
-                    paragraphs.append(para)
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as stream:
+                paragraphs, total_chars = _read_text_paragraphs(stream)
 
-        finally:
-            if not hasattr(file_path, 'read'):
-                stream.close()
-
-        logger.info(f"TXT文件解析完成，共 {len(paragraphs)} 段")
+        logger.info(f"{label}文件解析完成，共 {len(paragraphs)} 段")
         return paragraphs, f"解析完成，共 {len(paragraphs)} 段，约 {total_chars} 字"
     
     except Exception as e:
-        logger.error(f"TXT文件解析失败: {e}")
+        logger.error(f"{label}文件解析失败: {e}")
         return [], f"读取失败：{str(e)}"
 
 
-def parse_pdf_file(file_path: str) -> Tuple[List[str], str]:
+def parse_txt_file(file_path: str, file_size: Optional[int] = None) -> Tuple[List[str], str]:
+    """
+    解析TXT文件
+    
+    Returns:
+        (段落列表, 状态信息)
+    """
+    return _parse_plain_text_file(file_path, file_size, "TXT")
+
+
+def parse_pdf_file(file_path: str, file_size: Optional[int] = None) -> Tuple[List[str], str]:
     """
     解析PDF文件
     
@@ -171,32 +195,34 @@ def parse_pdf_file(file_path: str) -> Tuple[List[str], str]:
         return [], "错误：缺少PyMuPDF依赖，请运行: pip install PyMuPDF"
     
     try:
-        file_size = os.path.getsize(file_path)
+        if file_size is None:
+            file_size = os.path.getsize(file_path)
         if file_size > MAX_FILE_SIZE:
             return [], f"错误：文件过大 ({file_size / 1024 / 1024:.1f}MB > 50MB)"
         
-        text = ""
+        def iter_page_texts():
+            for page_num, page in enumerate(doc):
+                try:
+                    yield page.get_text("text") + "\n"
+                except Exception as e:
+                    logger.warning(f"PDF页面 {page_num} 解析失败: {e}")
+
+        # 逐页分段，不在内存中拼出全文
         doc = fitz.open(file_path)
+        try:
+            paragraphs, total_chars = _split_paragraphs_streaming(iter_page_texts())
+        finally:
+            doc.close()
         
-        for page_num, page in enumerate(doc):
-            try:
-                page_text = page.get_text("text")
-                text += page_text + "\n"
-            except Exception as e:
-                logger.warning(f"PDF页面 {page_num} 解析失败: {e}")
-        
-        doc.close()
-        
-        paragraphs = _split_paragraphs(text)
         logger.info(f"PDF文件解析完成，共 {len(paragraphs)} 段")
-        return paragraphs, f"解析完成，共 {len(paragraphs)} 段，约 {len(text)} 字"
+        return paragraphs, f"解析完成，共 {len(paragraphs)} 段，约 {total_chars} 字"
     
     except Exception as e:
         logger.error(f"PDF文件解析失败: {e}")
         return [], f"读取失败：{str(e)}"
 
 
-def parse_epub_file(file_path: str) -> Tuple[List[str], str]:
+def parse_epub_file(file_path: str, file_size: Optional[int] = None) -> Tuple[List[str], str]:
     """
     解析EPUB文件
     
@@ -210,100 +236,42 @@ def parse_epub_file(file_path: str) -> Tuple[List[str], str]:
         return [], "错误：缺少ebooklib或beautifulsoup4依赖，请运行: pip install ebooklib beautifulsoup4"
     
     try:
-        file_size = os.path.getsize(file_path)
+        if file_size is None:
+            file_size = os.path.getsize(file_path)
         if file_size > MAX_FILE_SIZE:
             return [], f"错误：文件过大 ({file_size / 1024 / 1024:.1f}MB > 50MB)"
         
-        text = ""
-        book = epub.read_epub(file_path)
-        
-        for item in book.get_items():
-            if item.get_type() == epub.ITEM_DOCUMENT:
+        def iter_item_texts():
+            for item in book.get_items_of_type(epub.ITEM_DOCUMENT):
                 try:
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    text += soup.get_text(separator="\n") + "\n"
+                    soup = BeautifulSoup(item.get_content(), _html_parser_name())
+                    yield soup.get_text(separator="\n") + "\n"
                 except Exception as e:
                     logger.warning(f"EPUB章节解析失败: {e}")
+
+        # 逐章节分段，不在内存中拼出全文
+        book = epub.read_epub(file_path)
+        paragraphs, total_chars = _split_paragraphs_streaming(iter_item_texts())
         
-        paragraphs = _split_paragraphs(text)
         logger.info(f"EPUB文件解析完成，共 {len(paragraphs)} 段")
-        return paragraphs, f"解析完成，共 {len(paragraphs)} 段，约 {len(text)} 字"
+        return paragraphs, f"解析完成，共 {len(paragraphs)} 段，约 {total_chars} 字"
     
     except Exception as e:
         logger.error(f"EPUB文件解析失败: {e}")
         return [], f"读取失败：{str(e)}"
 
 
-def parse_md_file(file_path: str) -> Tuple[List[str], str]:
+def parse_md_file(file_path: str, file_size: Optional[int] = None) -> Tuple[List[str], str]:
     """
     解析Markdown文件
     
     Returns:
         (段落列表, 状态信息)
     """
-    try:
-        # 支持传入文件对象或路径
-        if hasattr(file_path, 'read'):
-            fobj: IO = file_path
-            # 尝试获取 size 属性
-            try:
-                fobj.seek(0, os.SEEK_END)
-                file_size = fobj.tell()
-                fobj.seek(0)
-            except Exception:
-                file_size = 0
-        else:
-            file_size = os.path.getsize(file_path)
-
-        if file_size and file_size > MAX_FILE_SIZE:
-            return [], f"错误：文件过大 ({file_size / 1024 / 1024:.1f}MB > 50MB)"
-
-        paragraphs: List[str] = []
-        buf_lines: List[str] = []
-        total_chars = 0
-
-        # 逐行读取以降低内存压力
-        if hasattr(file_path, 'read'):
-            stream = file_path
-        else:
-            stream = open(file_path, 'r', encoding='utf-8', errors='ignore')
-
-        try:
-            for line in stream:
-                stripped = line.rstrip('\n')
-                total_chars += len(stripped)
-
-                if stripped.strip() == '':
-                    # 空行 -> 段落结束
-                    if buf_lines:
-                        para = '\n'.join(buf_lines).strip()
-                        if len(para) >= MIN_PARAGRAPH_LENGTH:
-                            paragraphs.append(para)
-                        buf_lines = []
-                    continue
-
-                # 常规行
-                buf_lines.append(stripped)
-
-            # 最后一段
-            if buf_lines:
-                para = '\n'.join(buf_lines).strip()
-                if len(para) >= MIN_PARAGRAPH_LENGTH:
-                    paragraphs.append(para)
-
-        finally:
-            if not hasattr(file_path, 'read'):
-                stream.close()
-
-        logger.info(f"Markdown文件解析完成，共 {len(paragraphs)} 段")
-        return paragraphs, f"解析完成，共 {len(paragraphs)} 段，约 {total_chars} 字"
-    
-    except Exception as e:
-        logger.error(f"Markdown文件解析失败: {e}")
-        return [], f"读取失败：{str(e)}"
+    return _parse_plain_text_file(file_path, file_size, "Markdown")
 
 
-def parse_docx_file(file_path: str) -> Tuple[List[str], str]:
+def parse_docx_file(file_path: str, file_size: Optional[int] = None) -> Tuple[List[str], str]:
     """
     解析Word文档文件
     
@@ -316,7 +284,8 @@ def parse_docx_file(file_path: str) -> Tuple[List[str], str]:
         return [], "错误：缺少python-docx依赖，请运行: pip install python-docx"
     
     try:
-        file_size = os.path.getsize(file_path)
+        if file_size is None:
+            file_size = os.path.getsize(file_path)
         if file_size > MAX_FILE_SIZE:
             return [], f"错误：文件过大 ({file_size / 1024 / 1024:.1f}MB > 50MB)"
         
@@ -338,6 +307,24 @@ def parse_docx_file(file_path: str) -> Tuple[List[str], str]:
         return [], f"读取失败：{str(e)}"
 
 
+# 各格式对应的解析函数
+_PARSERS_BY_TYPE = {
+    FileType.TXT: parse_txt_file,
+    FileType.PDF: parse_pdf_file,
+    FileType.EPUB: parse_epub_file,
+    FileType.MD: parse_md_file,
+    FileType.DOCX: parse_docx_file,
+}
+
+
+def _remove_file_quietly(path: str) -> None:
+    """删除临时文件，失败时忽略"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
 def parse_novel_file(file_path: str) -> Tuple[List[str], str]:
     """
     解析小说文件（自动识别格式）
@@ -351,80 +338,45 @@ def parse_novel_file(file_path: str) -> Tuple[List[str], str]:
     if not file_path:
         return [], "无文件"
     
-    # 处理Gradio上传的文件对象或文件流
-    temp_path = None
-    if hasattr(file_path, 'name') and isinstance(file_path.name, str) and os.path.exists(file_path.name):
-        file_path = file_path.name
-    elif hasattr(file_path, 'read'):
-        # 将上传的流写入临时文件以便下游库处理（PDF/EPUB/DOCX 需要文件路径）
-        try:
-            tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.tmp')
-            chunk = file_path.read(8192)
-            while chunk:
-                if isinstance(chunk, str):
-                    tmp.write(chunk.encode('utf-8'))
-                else:
-                    tmp.write(chunk)
-                chunk = file_path.read(8192)
-            tmp.close()
-            temp_path = tmp.name
-            file_path = temp_path
-        except Exception as e:
-            logger.error(f"处理上传文件失败: {e}")
-            return [], f"读取上传文件失败: {e}"
-    
-    if not os.path.exists(file_path):
-        return [], f"文件不存在: {file_path}"
-    
-    file_type = get_file_type(file_path)
-    
-    if file_type == FileType.TXT:
-        try:
-            return parse_txt_file(file_path)
-        finally:
-            if temp_path:
-                try:
-                    os.remove(temp_path)
-                except Exception:
-                    pass
-    elif file_type == FileType.PDF:
-        try:
-            return parse_pdf_file(file_path)
-        finally:
-            if temp_path:
-                try:
-                    os.remove(temp_path)
-                except Exception:
-                    pass
-    elif file_type == FileType.EPUB:
-        try:
-            return parse_epub_file(file_path)
-        finally:
-            if temp_path:
-                try:
-                    os.remove(temp_path)
-                except Exception:
-                    pass
-    elif file_type == FileType.MD:
-        try:
-            return parse_md_file(file_path)
-        finally:
-            if temp_path:
-                try:
-                    os.remove(temp_path)
-                except Exception:
-                    pass
-    elif file_type == FileType.DOCX:
+    with contextlib.ExitStack() as stack:
+        # 处理Gradio上传的文件对象或文件流
+        if hasattr(file_path, 'name') and isinstance(file_path.name, str) and os.path.exists(file_path.name):
+            file_path = file_path.name
+        elif hasattr(file_path, 'read'):
+            # 将上传的流写入临时文件以便下游库处理（PDF/EPUB/DOCX 需要文件路径）
+            try:
+                tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.tmp')
+                # 无论从哪个分支返回都只在这里统一删除临时文件
+                stack.callback(_remove_file_quietly, tmp.name)
+                with tmp:
+                    # 只按第一块判断一次流的类型，其余交给 copyfileobj 大块复制
+                    first_chunk = file_path.read(UPLOAD_COPY_BUFFER)
+                    if isinstance(first_chunk, str):
+                        out = io.TextIOWrapper(tmp, encoding='utf-8', newline='')
+                    else:
+                        out = tmp
+                    out.write(first_chunk)
+                    shutil.copyfileobj(file_path, out, UPLOAD_COPY_BUFFER)
+                    if out is not tmp:
+                        out.flush()
+                        out.detach()
+                file_path = tmp.name
+            except Exception as e:
+                logger.error(f"处理上传文件失败: {e}")
+                return [], f"读取上传文件失败: {e}"
+        
+        # 先按扩展名判断格式，不支持的格式无需访问文件系统
+        parser = _PARSERS_BY_TYPE.get(get_file_type(file_path))
+        if parser is None:
+            return [], "不支持的文件格式（支持 txt/pdf/epub/md/docx）"
+        
+        # 一次 stat 同时完成存在性检查和大小获取，传给解析函数避免重复 stat
         try:
-            return parse_docx_file(file_path)
-        finally:
-            if temp_path:
-                try:
-                    os.remove(temp_path)
-                except Exception:
-                    pass
-    else:
-        return [], "不支持的文件格式（支持 txt/pdf/epub/md/docx）"
+            file_size = os.stat(file_path).st_size
+        except OSError:
+            return [], f"文件不存在: {file_path}"
+        
+        return parser(file_path, file_size)
 
 
 def _split_paragraphs(text: str, min_length: int = MIN_PARAGRAPH_LENGTH) -> List[str]:
@@ -439,15 +391,73 @@ def _split_paragraphs(text: str, min_length: int = MIN_PARAGRAPH_LENGTH) -> List
         段落列表
     """
     # 按多个换行符分割
-    raw_paragraphs = re.split(r'\n\s*\n+', text)
-    
-    # 清理和过滤
+    return _clean_paragraphs(_PARAGRAPH_SPLIT_RE.split(text), min_length)
+
+
+def _split_paragraphs_streaming(pieces: Iterable[str],
+                                min_length: int = MIN_PARAGRAPH_LENGTH,
+                                clean: Optional[Callable[[Iterable[str], int], List[str]]] = None
+                                ) -> Tuple[List[str], int]:
+    """
+    将依次产出的文本片段（如PDF逐页文本）分割为段落，不需要先拼出完整文本
+
+    结果与对 "".join(pieces) 调用 _split_paragraphs 相同（要求 min_length >= 1）；
+    clean 为切分后的段落处理函数，默认 _clean_paragraphs。
+
+    Returns:
+        (段落列表, 文本总字数)
+    """
+    if clean is None:
+        clean = _clean_paragraphs
+    paragraphs: List[str] = []
+    total_chars = 0
+    # 当前未结束段落的文本片段；除最后一个外均以非空白字符结尾
+    pending: List[str] = []
+    for piece in pieces:
+        total_chars += len(piece)
+        # 分隔符只由空白组成，新的分隔只可能从已缓存文本末尾的空白开始，
+        # 因此只需扫描这段空白和新片段，长段落不会被反复扫描
+        tail = pending.pop() if pending else ""
+        keep = len(tail.rstrip())
+        if keep:
+            pending.append(tail[:keep])
+        parts = _PARAGRAPH_SPLIT_RE.split(tail[keep:] + piece)
+        if len(parts) == 1:
+            pending.append(parts[0])
+            continue
+        # 最后一段可能被后续片段续上，留到下一轮；分隔符被片段截断时只影响
+        # 空白归属，段落经 strip 和长度过滤后结果不变
+        pending.append(parts[0])
+        parts[0] = "".join(pending)
+        pending = [parts.pop()]
+        paragraphs.extend(clean(parts, min_length))
+
+    paragraphs.extend(clean(_PARAGRAPH_SPLIT_RE.split("".join(pending)), min_length))
+    return paragraphs, total_chars
+
+
+def _strip_paragraphs(raw_paragraphs: Iterable[str], min_length: int) -> List[str]:
+    """去掉段落首尾空白并过滤过短的段落（TXT/MD 不做标记清理）"""
+    paragraphs = []
+    for para in raw_paragraphs:
+        para = para.strip()
+        if len(para) >= min_length:
+            paragraphs.append(para)
+    return paragraphs
+
+
+def _clean_paragraphs(raw_paragraphs: Iterable[str], min_length: int) -> List[str]:
+    """清理段落中的章节标题等特殊标记，并过滤过短的段落"""
+    chapter_sub = _CHAPTER_PREFIX_RE.sub
+    star_sub = _STAR_EDGE_RE.sub
     paragraphs = []
     for para in raw_paragraphs:
         para = para.strip()
-        # 移除章节标题等特殊标记
-        para = re.sub(r'^(第\d+章|Chapter \d+|第 \d+ 章)[：:：]?\s*', '', para)
-        para = re.sub(r'^\s*\*+\s*|\s*\*+\s*$', '', para)
+        # 移除章节标题等特殊标记（先用字符串判断，绝大多数段落无需跑正则）
+        if para.startswith(_CHAPTER_PREFIXES):
+            para = chapter_sub('', para)
+        if '*' in para:
+            para = star_sub('', para)
         
         if len(para) >= min_length:
             paragraphs.append(para)
@@ -457,8 +467,9 @@ def _split_paragraphs(text: str, min_length: int = MIN_PARAGRAPH_LENGTH) -> List
 
 def estimate_word_count(text: str) -> int:
     """估计中文字数（粗略估计）"""
-    chinese_count = len(re.findall(r'[\u4e00-\u9fff]', text))
-    english_count = len(re.findall(r'\b[a-zA-Z]+\b', text))
+    # 按连续汉字串匹配再累加长度，比逐字匹配生成的字符串少得多
+    chinese_count = sum(map(len, _CHINESE_RUN_RE.findall(text)))
+    english_count = len(_ENGLISH_WORD_RE.findall(text))
     # 中文按1字计算，英文按0.5字计算
     return chinese_count + int(english_count * 0.5)
 
@@ -488,92 +499,56 @@ def parse_novel_by_chapters(
                 text = f.read()
         elif file_type == FileType.PDF:
             import fitz
-            text = ""
             doc = fitz.open(file_path)
-            for page in doc:
-                text += page.get_text("text") + "\n"
-            doc.close()
+            try:
+                text = "".join(page.get_text("text") + "\n" for page in doc)
+            finally:
+                doc.close()
         elif file_type == FileType.EPUB:
             from ebooklib import epub
             from bs4 import BeautifulSoup
-            text = ""
             book = epub.read_epub(file_path)
-            for item in book.get_items():
-                if item.get_type() == epub.ITEM_DOCUMENT:
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    text += soup.get_text(separator="\n") + "\n"
+            text = "".join(
+                BeautifulSoup(item.get_content(), _html_parser_name()).get_text(separator="\n") + "\n"
+                for item in book.get_items_of_type(epub.ITEM_DOCUMENT)
+            )
         elif file_type == FileType.MD:
             with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
                 text = f.read()
         elif file_type == FileType.DOCX:
             from docx import Document
             doc = Document(file_path)
-            text = ""
-            for para in doc.paragraphs:
-                text += para.text + "\n"
+            text = "".join(para.text + "\n" for para in doc.paragraphs)
         else:
             return [], "不支持的文件格式"
 
         # 确定使用的正则表达式
+        # 逐行匹配时使用编译好的对象，不再经过 re 模块的缓存查找
         if custom_pattern and custom_pattern.strip():
-            patterns = [custom_pattern.strip()]
-        elif pattern_name in CHAPTER_PATTERNS:
-            patterns = CHAPTER_PATTERNS[pattern_name]
+            chapter_re = re.compile(custom_pattern.strip(), re.IGNORECASE)
         else:
-            patterns = CHAPTER_PATTERNS["默认"]
+            chapter_re = _COMPILED_CHAPTER_PATTERNS.get(
+                pattern_name, _COMPILED_CHAPTER_PATTERNS["默认"]
+            )
 
-        # 查找所有章节标题
-        chapters = []
+        # 先一次性找出所有章节标题所在行，再按相邻标题切片得到各章正文，
+        # 不再逐行把正文追加到缓冲列表
         lines = text.split('\n')
+        match = chapter_re.match
+        header_indices = [i for i, line in enumerate(lines) if match(line.strip())]
+        header_indices.append(len(lines))
 
-        current_chapter_num = 0
-        current_chapter_title = ""
-        current_chapter_content = []
-        chapter_start_pos = 0
-
-        for i, line in enumerate(lines):
-            line_stripped = line.strip()
-            is_chapter_header = False
-
-            # 检查是否匹配任何章节模式
-            for pattern in patterns:
-                if re.match(pattern, line_stripped, re.IGNORECASE):
-                    is_chapter_header = True
-                    break
-
-            if is_chapter_header:
-                # 保存上一章
-                if current_chapter_num > 0:
-                    content = '\n'.join(current_chapter_content).strip()
-                    if content:
-                        chapters.append(ChapterInfo(
-                            num=current_chapter_num,
-                            title=current_chapter_title,
-                            content=content,
-                            start_pos=chapter_start_pos,
-                            end_pos=i
-                        ))
-
-                # 提取章节号和标题
-                current_chapter_num += 1
-                current_chapter_title = line_stripped
-                current_chapter_content = []
-                chapter_start_pos = i
-            else:
-                # 跳过空行但保留内容
-                if line_stripped or current_chapter_content:
-                    current_chapter_content.append(line)
-
-        # 保存最后一章
-        if current_chapter_num > 0 and current_chapter_content:
-            content = '\n'.join(current_chapter_content).strip()
+        chapters = []
+        for num, (start, end) in enumerate(zip(header_indices, header_indices[1:]), 1):
+            # 标题后的空行会被 strip 去掉，结果与逐行跳过空行一致
+            content = '\n'.join(lines[start + 1:end]).strip()
             if content:
                 chapters.append(ChapterInfo(
-                    num=current_chapter_num,
-                    title=current_chapter_title,
+                    num=num,
+                    title=lines[start].strip(),
                     content=content,
-                    start_pos=chapter_start_pos,
-                    end_pos=len(lines)
+                    start_pos=start,
+                    end_pos=end
                 ))
 
         logger.info(f"按章节解析完成，共 {len(chapters)} 章")
@@ -637,46 +612,84 @@ def split_by_word_count(text: str, word_count: int) -> List[str]:
         raise ValueError("字数必须大于0")
 
     # 按字数均匀分段
-    segments = []
-    total_length = len(text)
-    start = 0
+    segments = list(iter_split_by_word_count([text], word_count))
 
-    while start < total_length:
-        end = start + word_count
-        if end > total_length:
-            end = total_length
+    logger.info(f"按字数分段完成，共 {len(segments)} 段，每段约 {word_count} 字")
+    return segments
 
-        segment = text[start:end].strip()
-        if segment:
-            segments.append(segment)
 
-        start = end
+def iter_split_by_word_count(pieces: Iterable[str], word_count: int) -> Iterator[str]:
+    """
+    对依次拼接的文本片段按字数分段（逐段产出，不需要先拼出完整文本）
 
-    logger.info(f"按字数分段完成，共 {len(segments)} 段，每段约 {word_count} 字")
-    return segments
+    结果与对 "".join(pieces) 调用 split_by_word_count 相同。
+
+    Args:
+        pieces: 文本片段（按顺序拼接即为完整文本）
+        word_count: 每段的字数
+    """
+    if word_count <= 0:
+        raise ValueError("字数必须大于0")
 
+    buf = ""
+    for piece in pieces:
+        buf += piece
+        start = 0
+        while len(buf) - start >= word_count:
+            segment = buf[start:start + word_count].strip()
+            if segment:
+                yield segment
+            start += word_count
+        buf = buf[start:]
 
-def split_by_pattern(text: str, pattern: str, keep_marker: bool = True) -> List[str]:
+    segment = buf.strip()
+    if segment:
+        yield segment
+
+
+def pack_segments(segments: List[str], max_chars: int, separator: str = "\n\n") -> List[str]:
     """
-    按固定文本/变量分段
+    将相邻的短段落合并为不超过 max_chars 字的块，减少API调用次数
 
     Args:
-        text: 原始文本
-        pattern: 分段标记（支持变量：%章、%节、%回，或自定义文本）
-        keep_marker: 是否保留分段标记
+        segments: 段落列表
+        max_chars: 每块的最大字数（单段超过该长度时保持原样）
+        separator: 段落之间的连接符
 
     Returns:
-        分段后的文本列表
+        合并后的文本块列表
     """
-    if not text or not text.strip():
-        return []
+    packed = []
+    buf: List[str] = []
+    buf_len = 0
 
-    if not pattern or not pattern.strip():
-        raise ValueError("分段标记不能为空")
+    for segment in segments:
+        added = len(segment) + (len(separator) if buf else 0)
+        if buf and buf_len + added > max_chars:
+            packed.append(separator.join(buf))
+            buf = []
+            buf_len = 0
+            added = len(segment)
+        buf.append(segment)
+        buf_len += added
+
+    if buf:
+        packed.append(separator.join(buf))
+
+    return packed
 
+
+@lru_cache(maxsize=32)
+def _compile_split_pattern(pattern: str) -> Pattern:
+    """
+    将分段标记转换为编译好的正则表达式（按标记缓存，重复解析时不再重新编译）
+
+    Raises:
+        re.error: 正则表达式无效
+    """
     # 智能识别：如果用户输入"第x章"、"第X章"等，自动转换为正则表达式
     # 检查是否包含"第"和"章"、"节"、"回"的组合
-    pattern_lower = pattern.strip().lower()
+    pattern_lower = pattern.lower()
     
     # 检查是否是简化的模式（如"第x章"、"第X章"）
     if pattern_lower in ['第x章', '第x章', '第x章', '第x章']:
@@ -695,7 +708,7 @@ def split_by_pattern(text: str, pattern: str, keep_marker: bool = True) -> List[
         logger.info("检测到'第x回'模式，自动转换为正则表达式")
     elif '%章' in pattern_lower or '%节' in pattern_lower or '%回' in pattern_lower:
         # 使用变量替换
-        regex_pattern = pattern.strip()
+        regex_pattern = pattern
         # %章 -> 匹配"第X章"、"第x章"等（支持中文和阿拉伯数字）
         regex_pattern = regex_pattern.replace('%章', r'[一二三四五六七八九十百千万零〇0123456789]+\s*章')
         # %节 -> 匹配"第X节"、"第x节"等（支持中文和阿拉伯数字）
@@ -707,18 +720,44 @@ def split_by_pattern(text: str, pattern: str, keep_marker: bool = True) -> List[
             regex_pattern = '^' + regex_pattern
     else:
         # 不包含章节标记，直接使用原始模式
-        regex_pattern = pattern.strip()
+        regex_pattern = pattern
+
+    return re.compile(regex_pattern, flags=re.MULTILINE | re.IGNORECASE)
+
+
+def split_by_pattern(text: str, pattern: str, keep_marker: bool = True) -> List[str]:
+    """
+    按固定文本/变量分段
+
+    Args:
+        text: 原始文本
+        pattern: 分段标记（支持变量：%章、%节、%回，或自定义文本）
+        keep_marker: 是否保留分段标记
+
+    Returns:
+        分段后的文本列表
+    """
+    if not text or not text.strip():
+        return []
+
+    if not pattern or not pattern.strip():
+        raise ValueError("分段标记不能为空")
+
+    try:
+        compiled = _compile_split_pattern(pattern.strip())
+    except re.error as e:
+        raise ValueError(f"无效的正则表达式: {e}")
 
     # 尝试按模式分割
     try:
         # 如果保留标记，使用正则表达式查找所有匹配位置
         if keep_marker:
             # 查找所有匹配的位置
-            matches = list(re.finditer(regex_pattern, text, flags=re.MULTILINE | re.IGNORECASE))
+            matches = list(compiled.finditer(text))
 
             if not matches:
                 # 没有匹配，返回整个文本
-                logger.warning(f"未找到匹配的模式: {regex_pattern}，返回整个文本")
+                logger.warning(f"未找到匹配的模式: {compiled.pattern}，返回整个文本")
                 return [text.strip()] if text.strip() else []
 
             segments = []
@@ -762,7 +801,7 @@ def split_by_pattern(text: str, pattern: str, keep_marker: bool = True) -> List[
             segments = result
         else:
             # 不保留标记，直接分割
-            segments = re.split(regex_pattern, text, flags=re.MULTILINE | re.IGNORECASE)
+            segments = compiled.split(text)
 
         # 清理空段落
         segments = [seg.strip() for seg in segments if seg.strip()]
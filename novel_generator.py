@@ -8,15 +8,21 @@ import re
 import logging
 import json
 import os
-from typing import List, Dict, Optional, Tuple
+import time
+from typing import List, Dict, Optional, Tuple, Iterator
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from api_client import get_api_client
+from api_client import get_api_client, DETERMINISTIC_CACHE_TTL
 from config import get_config
 
 logger = logging.getLogger(__name__)
 
+# 流式输出进行中的状态标记（流式生成器在最终结果前产出的状态）
+STREAMING_STATUS = "生成中"
+# 流式输出向界面推送部分结果的最小间隔（秒）
+STREAM_YIELD_INTERVAL = 0.2
+
 # 缓存目录
 CACHE_DIR = Path("cache/generation")
 CACHE_DIR.mkdir(parents=True, exist_ok=True)
@@ -195,6 +201,13 @@ class NovelGenerator:
     def __init__(self):
         self.config = get_config()
         self.api_client = get_api_client()
+
+    def _generate_cached(self, messages: List[Dict], attempt: int) -> Tuple[bool, str]:
+        """
+        确定性模式下复用相同输入的历史结果（仅首次尝试读缓存，重试时强制重新生成）
+        """
+        use_cache = bool(getattr(self.config.generation, "deterministic_cache", False)) and attempt == 0
+        return self.api_client.generate(messages, use_cache=use_cache, cache_ttl=DETERMINISTIC_CACHE_TTL)
     
     def generate_outline(
         self,
@@ -373,24 +386,28 @@ class NovelGenerator:
 
         style = style_template or PRESET_TEMPLATES["重写风格 - 默认"]
 
-        prompt = f"""请按照以下风格重写原文，保留原意和情节，但加入更多细节：
+        # 固定的风格与要求放在前面、原文放在最后，同一风格下各段请求共享相同前缀，
+        # 便于服务端的前缀缓存（prompt caching）命中
+        instructions = f"""你是优秀的小说编辑，擅长用生动细腻的笔触改进文本。
 
-风格要求：{style}
+请按照以下风格重写用户给出的原文，保留原意和情节，但加入更多细节：
 
-原文：
-{text}
+风格要求：{style}
 
 【重要要求】
 1. 必须输出完整的重写后的小说内容，字数应该与原文相当
 2. 绝对不能只输出"重写成功"、"润色成功"、"生成成功"等状态消息
 3. 必须输出实际的重写文本，包含丰富的细节描写和情节展开
 4. 如果原文有1000字，重写后也应该有1000字左右
-5. 不要输出任何说明性文字或状态确认消息
+5. 不要输出任何说明性文字或状态确认消息"""
+
+        prompt = f"""原文：
+{text}
 
 请严格按照以上要求输出完整的重写内容。"""
 
         messages = [
-            {"role": "system", "content": "你是优秀的小说编辑，擅长用生动细腻的笔触改进文本。"},
+            {"role": "system", "content": instructions},
             {"role": "user", "content": prompt}
         ]
 
@@ -403,7 +420,7 @@ class NovelGenerator:
 
         for attempt in range(max_retries):
             logger.debug(f"重写尝试 {attempt + 1}/{max_retries}")
-            success, content = self.api_client.generate(messages, use_cache=False)
+            success, content = self._generate_cached(messages, attempt)
 
             if not success:
                 logger.error(f"重写失败（尝试 {attempt + 1}/{max_retries}）: {content}")
@@ -516,20 +533,20 @@ class NovelGenerator:
             "improve_pacing": "请调整以下文本的节奏，优化情节推进速度，使故事更加引人入胜。",
         }
 
-        prompt = polish_prompts.get(polish_type, polish_prompts["general"])
+        # 固定的润色要求放在前面、原文放在最后，便于服务端的前缀缓存命中
+        instructions = "你是专业的文学编辑和润色专家，擅长提升文本质量和文笔水平。\n\n"
+        instructions += polish_prompts.get(polish_type, polish_prompts["general"])
 
         if custom_requirements:
-            prompt += f"\n\n额外要求：{custom_requirements}"
+            instructions += f"\n\n额外要求：{custom_requirements}"
 
-        prompt += f"""
-
-原文：
-{text}
+        instructions += "\n\n请只输出润色后的文本或建议，不要其他内容。"
 
-请只输出润色后的文本或建议，不要其他内容。"""
+        prompt = f"""原文：
+{text}"""
 
         messages = [
-            {"role": "system", "content": "你是专业的文学编辑和润色专家，擅长提升文本质量和文笔水平。"},
+            {"role": "system", "content": instructions},
             {"role": "user", "content": prompt}
         ]
 
@@ -542,7 +559,7 @@ class NovelGenerator:
 
         for attempt in range(max_retries):
             logger.debug(f"润色尝试 {attempt + 1}/{max_retries}")
-            success, content = self.api_client.generate(messages, use_cache=False)
+            success, content = self._generate_cached(messages, attempt)
 
             if not success:
                 logger.error(f"润色失败（尝试 {attempt + 1}/{max_retries}）: {content}")
@@ -698,36 +715,9 @@ class NovelGenerator:
         if not existing_text or not existing_text.strip():
             return "", "已有文本为空"
 
-        style_desc = self._build_style_description()
-
-        # 获取已有文本的末尾部分作为上下文
-        previous_content = existing_text[-1500:] if len(existing_text) > 1500 else existing_text
-
-        prompt = f"""请续写小说《{novel_title}》的下一章内容。
-
-【已有设定】
-人物设定：{character_setting}
-世界观：{world_setting}
-主线剧情：{plot_idea}
-
-【风格要求】
-{style_desc}
-
-【前文回顾】（最近1500字）
-{previous_content}
-
-【续写要求】
-1. 根据前文内容自然续写下一章
-2. 保持与前文的连贯性，包括人物性格、情节发展、对话风格等
-3. 字数约 {target_words} 字
-4. 不要重复前文已有的内容
-5. 结尾留下适当的悬念或铺垫
-6. 只输出续写的正文，不要章节标题、说明或其他内容"""
-
-        messages = [
-            {"role": "system", "content": "你是优秀的长篇小说作家，擅长创作引人入胜的故事和自然的情节衔接。"},
-            {"role": "user", "content": prompt}
-        ]
+        messages = self._build_continue_messages(
+            existing_text, novel_title, character_setting, world_setting, plot_idea, target_words
+        )
 
         logger.info(f"开始续写小说: {novel_title}，已有文本长度: {len(existing_text)}字，目标字数: {target_words}")
 
@@ -738,7 +728,7 @@ class NovelGenerator:
 
         for attempt in range(max_retries):
             logger.debug(f"续写尝试 {attempt + 1}/{max_retries}")
-            success, content = self.api_client.generate(messages, use_cache=False)
+            success, content = self._generate_cached(messages, attempt)
 
             if not success:
                 logger.error(f"续写失败（尝试 {attempt + 1}/{max_retries}）: {content}")
@@ -785,6 +775,101 @@ class NovelGenerator:
         logger.error(f"续写在{max_retries}次尝试后仍然失败")
         return "", f"续写失败：在{max_retries}次尝试后仍然失败"
 
+    def _build_continue_messages(
+        self,
+        existing_text: str,
+        novel_title: str,
+        character_setting: str,
+        world_setting: str,
+        plot_idea: str,
+        target_words: int
+    ) -> List[Dict[str, str]]:
+        """构建续写请求的消息列表"""
+        style_desc = self._build_style_description()
+
+        # 获取已有文本的末尾部分作为上下文
+        previous_content = existing_text[-1500:] if len(existing_text) > 1500 else existing_text
+
+        prompt = f"""请续写小说《{novel_title}》的下一章内容。
+
+【已有设定】
+人物设定：{character_setting}
+世界观：{world_setting}
+主线剧情：{plot_idea}
+
+【风格要求】
+{style_desc}
+
+【续写要求】
+1. 根据前文内容自然续写下一章
+2. 保持与前文的连贯性，包括人物性格、情节发展、对话风格等
+3. 字数约 {target_words} 字
+4. 不要重复前文已有的内容
+5. 结尾留下适当的悬念或铺垫
+6. 只输出续写的正文，不要章节标题、说明或其他内容
+
+【前文回顾】（最近1500字）
+{previous_content}"""
+
+        messages = [
+            {"role": "system", "content": "你是优秀的长篇小说作家，擅长创作引人入胜的故事和自然的情节衔接。"},
+            {"role": "user", "content": prompt}
+        ]
+
+        return messages
+
+    def continue_writing_stream(
+        self,
+        existing_text: str,
+        novel_title: str,
+        character_setting: str,
+        world_setting: str,
+        plot_idea: str,
+        target_words: int = 2500
+    ) -> Iterator[Tuple[str, str]]:
+        """
+        流式续写小说内容
+
+        生成过程中产出 (已生成的部分文本, STREAMING_STATUS)，最后产出一次与
+        continue_writing 相同的 (续写内容, 错误信息或成功提示)。
+        确定性模式下或流式结果无效时，退回到带缓存与重试的 continue_writing。
+        """
+        args = (existing_text, novel_title, character_setting, world_setting, plot_idea, target_words)
+
+        if not existing_text or not existing_text.strip():
+            yield "", "已有文本为空"
+            return
+
+        if getattr(self.config.generation, "deterministic_cache", False):
+            yield self.continue_writing(*args)
+            return
+
+        messages = self._build_continue_messages(*args)
+        logger.info(f"开始流式续写小说: {novel_title}，已有文本长度: {len(existing_text)}字，目标字数: {target_words}")
+
+        parts: List[str] = []
+        last_yield = 0.0
+        for ok, piece in self.api_client.generate_stream(messages):
+            if not ok:
+                logger.error(f"流式续写失败: {piece}")
+                yield "", piece
+                return
+            parts.append(piece)
+            now = time.monotonic()
+            if now - last_yield >= STREAM_YIELD_INTERVAL:
+                last_yield = now
+                yield "".join(parts), STREAMING_STATUS
+
+        content = "".join(parts).strip()
+        if len(content) < 100:
+            # 与 continue_writing 的校验一致：过短（含状态消息）视为无效
+            logger.warning(f"流式续写内容过短（{len(content)}字），改用普通请求重试")
+            yield self.continue_writing(*args)
+            return
+
+        logger.info(f"流式续写成功，字数: {len(content)}")
+        yield content, "续写成功"
+
     def _build_style_description(self) -> str:
         """构建风格描述"""
         gen = self.config.generation
@@ -824,13 +909,20 @@ def save_generation_cache(project_id: str, cache_data: Dict) -> Tuple[bool, str]
         return False, "缓存数据不能为空"
 
     cache_file = CACHE_DIR / f"{project_id}.json"
+    tmp_file = CACHE_DIR / f"{project_id}.json.tmp"
 
     try:
-        with open(cache_file, 'w', encoding='utf-8') as f:
+        # 先写临时文件再原子替换，避免写入中断导致缓存损坏
+        with open(tmp_file, 'w', encoding='utf-8') as f:
             json.dump(cache_data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, cache_file)
         logger.info(f"缓存已保存: {cache_file}")
         return True, "缓存保存成功"
     except Exception as e:
+        try:
+            tmp_file.unlink()
+        except OSError:
+            pass
         logger.error(f"保存缓存失败: {e}")
         return False, f"保存缓存失败: {str(e)}"
 
@@ -920,6 +1012,29 @@ def list_generation_caches() -> List[Dict]:
     return caches
 
 
+def _scan_json_size(directory: Path, recursive: bool) -> int:
+    """
+    统计目录下所有json文件的总大小（字节）
+
+    使用os.scandir遍历，每个文件只stat一次（Windows下stat信息随目录项返回，无需额外系统调用）
+    """
+    total_size = 0
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        total_size += _scan_json_size(Path(entry.path), recursive)
+                elif entry.name.endswith(".json"):
+                    try:
+                        total_size += entry.stat().st_size
+                    except OSError:
+                        pass
+    except FileNotFoundError:
+        pass
+    return total_size
+
+
 def get_cache_size() -> int:
     """
     获取缓存总大小（字节）
@@ -927,11 +1042,7 @@ def get_cache_size() -> int:
     Returns:
         缓存总大小
     """
-    total_size = 0
-    if CACHE_DIR.exists():
-        for cache_file in CACHE_DIR.glob("*.json"):
-            total_size += cache_file.stat().st_size
-    return total_size
+    return _scan_json_size(CACHE_DIR, recursive=False)
 
 
 # ==================== 章节摘要管理 ====================
@@ -1170,8 +1281,4 @@ def get_summary_cache_size() -> int:
     Returns:
         缓存总大小
     """
-    total_size = 0
-    if SUMMARY_CACHE_DIR.exists():
-        for summary_file in SUMMARY_CACHE_DIR.rglob("*.json"):
-            total_size += summary_file.stat().st_size
-    return total_size
+    return _scan_json_size(SUMMARY_CACHE_DIR, recursive=True)
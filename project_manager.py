@@ -6,10 +6,11 @@
 """
 import json
 import os
+import itertools
 import re
 import tempfile
 import logging
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterator
 from datetime import datetime
 from pathlib import Path
 
@@ -20,6 +21,49 @@ logger = logging.getLogger(__name__)
 PROJECTS_DIR = "projects"
 os.makedirs(PROJECTS_DIR, exist_ok=True)
 
+# 章节追加日志（生成过程中逐章追加，完整保存项目时合并进metadata.json后删除）
+CHAPTER_LOG_FILE = "chapters.jsonl"
+
+
+def _touch_projects_dir() -> None:
+    """更新项目目录的修改时间，使基于mtime的项目列表缓存失效"""
+    try:
+        os.utime(PROJECTS_DIR, None)
+    except OSError as e:
+        logger.debug(f"更新项目目录时间戳失败: {e}")
+
+
+def _read_chapter_log(project_dir: str) -> Dict[int, Dict]:
+    """读取章节追加日志，同一章节以最后一次记录为准（忽略写入中断的残行）"""
+    log_file = os.path.join(project_dir, CHAPTER_LOG_FILE)
+    records: Dict[int, Dict] = {}
+    if not os.path.exists(log_file):
+        return records
+
+    with open(log_file, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.warning(f"跳过损坏的章节日志行: {log_file}")
+                continue
+            records[int(record.get("num", 0))] = record
+    return records
+
+
+def _merge_chapter_log(project_dir: str, chapters: List[Dict]) -> List[Dict]:
+    """将章节追加日志合并到元数据中的章节列表（按章节号覆盖或追加）"""
+    records = _read_chapter_log(project_dir)
+    if not records:
+        return chapters
+
+    merged = {int(ch.get("num", 0)): ch for ch in chapters}
+    merged.update(records)
+    return [merged[num] for num in sorted(merged)]
+
 
 class ProjectManager:
     """项目管理器"""
@@ -119,11 +163,12 @@ class ProjectManager:
 
             # 保存小说文本（如果有章节）
             if project.chapters:
-                novel_text = f"# {project.title}\n\n"
+                # 收集各章后一次拼接，避免 += 随章节数反复复制整篇文本
+                novel_parts = [f"# {project.title}\n\n"]
                 for chapter in project.chapters:
                     if chapter.content:
-                        novel_text += f"## 第{chapter.num}章 {chapter.title}\n\n"
-                        novel_text += chapter.content + "\n\n"
+                        novel_parts.append(f"## 第{chapter.num}章 {chapter.title}\n\n{chapter.content}\n\n")
+                novel_text = "".join(novel_parts)
 
                 novel_file = os.path.join(project_dir, "novel.md")
                 tmp_novel = None
@@ -140,6 +185,12 @@ class ProjectManager:
                             pass
                     raise
 
+            # 章节已完整写入metadata.json，追加日志不再需要
+            log_file = os.path.join(project_dir, CHAPTER_LOG_FILE)
+            if os.path.exists(log_file):
+                os.remove(log_file)
+
+            _touch_projects_dir()
             logger.info(f"项目已保存: {project_id}")
             return True, f"项目已保存: {project_id}"
 
@@ -147,6 +198,69 @@ class ProjectManager:
             logger.error(f"项目保存失败: {e}")
             return False, f"项目保存失败: {str(e)}"
     
+    @staticmethod
+    def append_chapter(project_id: str, chapter: Chapter) -> Tuple[bool, str]:
+        """
+        追加保存单个章节（只写入该章节，不重写整个项目）
+
+        Returns:
+            (成功标志, 状态信息)
+        """
+        try:
+            project_dir = os.path.join(PROJECTS_DIR, project_id)
+            if not os.path.exists(project_dir):
+                return False, f"项目不存在: {project_id}"
+
+            log_file = os.path.join(project_dir, CHAPTER_LOG_FILE)
+            record = json.dumps(chapter.to_dict(), ensure_ascii=False) + "\n"
+            with open(log_file, 'a+b') as f:
+                # 上次写入中断留下的残行没有换行符，先补上换行，避免新记录接在残行后一起被丢弃
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+                f.write(record.encode('utf-8'))
+
+            _touch_projects_dir()
+            return True, f"章节已保存: 第{chapter.num}章"
+
+        except Exception as e:
+            logger.error(f"章节保存失败: {e}")
+            return False, f"章节保存失败: {str(e)}"
+
+    @staticmethod
+    def load_chapter_log(project_id: str) -> Dict[int, Dict]:
+        """
+        读取尚未合并到元数据的追加章节
+
+        Returns:
+            {章节号: 章节字典}
+        """
+        try:
+            return _read_chapter_log(os.path.join(PROJECTS_DIR, project_id))
+        except Exception as e:
+            logger.warning(f"读取章节日志失败 {project_id}: {e}")
+            return {}
+
+    @staticmethod
+    def load_metadata(project_id: str) -> Optional[Dict]:
+        """
+        读取项目元数据（已合并章节追加日志）
+
+        Returns:
+            元数据字典 或 None
+        """
+        project_dir = os.path.join(PROJECTS_DIR, project_id)
+        metadata_file = os.path.join(project_dir, "metadata.json")
+        if not os.path.exists(metadata_file):
+            return None
+
+        with open(metadata_file, 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        metadata["chapters"] = _merge_chapter_log(project_dir, metadata.get("chapters", []))
+        return metadata
+
     @staticmethod
     def load_project(project_id: str) -> Tuple[Optional[NovelProject], str]:
         """
@@ -161,14 +275,11 @@ class ProjectManager:
             if not os.path.exists(project_dir):
                 return None, f"项目不存在: {project_id}"
             
-            metadata_file = os.path.join(project_dir, "metadata.json")
+            metadata = ProjectManager.load_metadata(project_id)
             
-            if not os.path.exists(metadata_file):
+            if metadata is None:
                 return None, "项目元数据文件损坏"
             
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
-            
             # 重建项目对象
             project = NovelProject(
                 title=metadata.get("title", ""),
@@ -200,52 +311,69 @@ class ProjectManager:
             return None, f"项目加载失败: {str(e)}"
     
     @staticmethod
-    def list_projects() -> List[Dict]:
+    def iter_projects() -> Iterator[Dict]:
         """
-        列出所有项目
-        
-        Returns:
-            项目信息列表 [{"id": "...", "title": "...", "genre": "...", "created_at": "...", "updated_at": "..."}]
+        逐个读取项目元数据（生成器，未排序）
+
+        Yields:
+            项目信息字典
         """
-        try:
-            projects = []
-            
-            if not os.path.exists(PROJECTS_DIR):
-                return projects
-            
-            for project_id in os.listdir(PROJECTS_DIR):
-                project_dir = os.path.join(PROJECTS_DIR, project_id)
-                
-                if not os.path.isdir(project_dir):
+        if not os.path.exists(PROJECTS_DIR):
+            return
+
+        with os.scandir(PROJECTS_DIR) as entries:
+            for entry in entries:
+                if not entry.is_dir():
                     continue
-                
-                metadata_file = os.path.join(project_dir, "metadata.json")
-                
+
+                metadata_file = os.path.join(entry.path, "metadata.json")
+
                 if not os.path.exists(metadata_file):
                     continue
-                
+
                 try:
                     with open(metadata_file, 'r', encoding='utf-8') as f:
                         metadata = json.load(f)
-                    
-                    projects.append({
-                        "id": project_id,
+
+                    chapters = _merge_chapter_log(entry.path, metadata.get("chapters", []))
+                    yield {
+                        "id": entry.name,
                         "title": metadata.get("title", "未命名"),
                         "genre": metadata.get("genre", ""),
                         "created_at": metadata.get("created_at", ""),
                         "updated_at": metadata.get("updated_at", ""),
-                        "chapter_count": len(metadata.get("chapters", [])),
-                        "completed_chapters": sum(1 for ch in metadata.get("chapters", []) if ch.get("content", "").strip())
-                    })
+                        "chapter_count": len(chapters),
+                        "completed_chapters": sum(1 for ch in chapters if ch.get("content", "").strip())
+                    }
                 except Exception as e:
-                    logger.warning(f"读取项目元数据失败 {project_id}: {e}")
-            
+                    logger.warning(f"读取项目元数据失败 {entry.name}: {e}")
+
+    @staticmethod
+    def list_projects(limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """
+        列出项目（按更新时间倒序）
+
+        Args:
+            limit: 最多返回的项目数，None 表示全部
+            offset: 跳过的项目数
+
+        Returns:
+            项目信息列表 [{"id": "...", "title": "...", "genre": "...", "created_at": "...", "updated_at": "..."}]
+        """
+        try:
             # 按更新时间排序
-            projects.sort(key=lambda x: x.get("updated_at", ""), reverse=True)
-            
+            projects = sorted(
+                ProjectManager.iter_projects(),
+                key=lambda x: x.get("updated_at", ""),
+                reverse=True
+            )
+
             logger.info(f"找到 {len(projects)} 个项目")
+            if offset or limit is not None:
+                stop = None if limit is None else offset + limit
+                return list(itertools.islice(projects, offset, stop))
             return projects
-        
+
         except Exception as e:
             logger.error(f"列出项目失败: {e}")
             return []
@@ -281,6 +409,7 @@ class ProjectManager:
             
             import shutil
             shutil.rmtree(project_dir)
+            _touch_projects_dir()
             
             logger.info(f"项目已删除: {project_id}")
             return True, f"项目已删除: {project_id}"
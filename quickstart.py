@@ -8,6 +8,7 @@ AI小说生成工具 Pro v2.0 - 快速开始脚本
 import os
 import sys
 import subprocess
+import importlib.util
 import json
 from pathlib import Path
 
@@ -139,53 +140,45 @@ def create_default_config():
     print_success(f"配置文件已创建: {config_file}")
     print_info("请根据需要编辑配置文件或在Web UI中修改")
 
+def is_installed(module):
+    """检查模块是否已安装（只查找模块位置，不实际导入，避免加载 gradio/pandas 等大型依赖）"""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
 def install_dependencies():
     """安装依赖"""
     print_header("安装Python依赖")
     
-    try:
-        import gradio
-        print_success("gradio 已安装")
-    except ImportError:
-        print_warning("gradio 未安装，正在安装...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "gradio>=4.0.0"])
-    
-    try:
-        import pandas
-        print_success("pandas 已安装")
-    except ImportError:
-        print_warning("pandas 未安装，正在安装...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "pandas>=2.0.0"])
-    
-    try:
-        import openai
-        print_success("openai 已安装")
-    except ImportError:
-        print_warning("openai 未安装，正在安装...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "openai>=1.0.0"])
+    required = [
+        ("gradio", "gradio", "gradio>=4.0.0"),
+        ("pandas", "pandas", "pandas>=2.0.0"),
+        ("openai", "openai", "openai>=1.0.0"),
+        ("python-docx", "docx", "python-docx>=0.8.10")
+    ]
     
-    try:
-        import docx
-        print_success("python-docx 已安装")
-    except ImportError:
-        print_warning("python-docx 未安装，正在安装...")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "python-docx>=0.8.10"])
+    for name, module, requirement in required:
+        if is_installed(module):
+            print_success(f"{name} 已安装")
+        else:
+            print_warning(f"{name} 未安装，正在安装...")
+            subprocess.check_call([sys.executable, "-m", "pip", "install", requirement])
     
     # 可选依赖
     print_info("检查可选依赖...")
     
     optional = [
-        ("fitz (PyMuPDF)", "PyMuPDF"),
-        ("ebooklib", "ebooklib"),
-        ("bs4 (beautifulsoup4)", "beautifulsoup4"),
-        ("markdown", "markdown")
+        ("fitz (PyMuPDF)", "fitz", "PyMuPDF"),
+        ("ebooklib", "ebooklib", "ebooklib"),
+        ("bs4 (beautifulsoup4)", "bs4", "beautifulsoup4"),
+        ("markdown", "markdown", "markdown")
     ]
     
-    for name, package in optional:
-        try:
-            __import__(package.replace("-", "_"))
+    for name, module, package in optional:
+        if is_installed(module):
             print_success(f"{name} 已安装")
-        except ImportError:
+        else:
             print_warning(f"{name} 未安装（可选，但建议安装）")
             print_info(f"安装方式: pip install {package}")
 
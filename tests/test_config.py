@@ -0,0 +1,73 @@
+"""
+配置管理模块测试
+"""
+import json
+import os
+
+import pytest
+
+import config
+from config import Backend, ConfigManager
+
+
+@pytest.fixture
+def fresh_config(tmp_path, monkeypatch):
+    """在临时目录中创建新的配置管理器实例"""
+    monkeypatch.chdir(tmp_path)
+    os.makedirs(config.CONFIG_DIR, exist_ok=True)
+    config._parse_config_file.cache_clear()
+
+    def factory() -> ConfigManager:
+        ConfigManager._instance = None
+        return ConfigManager()
+
+    yield factory
+    ConfigManager._instance = None
+    config._parse_config_file.cache_clear()
+
+
+def _saved_backend_names():
+    with open(config.CONFIG_FILE, "r", encoding="utf-8") as f:
+        return [b["name"] for b in json.load(f)["backends"]]
+
+
+def test_missing_secrets_does_not_delete_backends(fresh_config):
+    """密钥文件丢失后保存其他设置，不应把无法还原密钥的后端从配置中删除"""
+    manager = fresh_config()
+    manager.backends = [Backend("A", "openai", "https://a.example", "key-a", "m")]
+    assert manager.save()[0]
+
+    os.remove(config.SECRETS_FILE)
+    manager = fresh_config()
+    assert manager.backends == []
+
+    manager.generation.temperature = 0.9
+    assert manager.save()[0]
+    assert _saved_backend_names() == ["A"]
+
+
+def test_secrets_referenced_by_backup_are_kept(fresh_config):
+    """更换API Key后，配置备份仍引用的旧密钥要保留在密钥文件中"""
+    manager = fresh_config()
+    manager.backends = [Backend("A", "openai", "https://a.example", "key-old", "m")]
+    assert manager.save()[0]
+
+    manager.get_backend("A").api_key = "key-new"
+    assert manager.save()[0]
+
+    with open(config.SECRETS_FILE, "r", encoding="utf-8") as f:
+        assert sorted(json.load(f).values()) == ["key-new", "key-old"]
+
+
+def test_default_load_config_returns_copy(fresh_config):
+    """没有配置文件时 load_config 返回的默认配置，修改后不应影响共享的静态配置项"""
+    fresh_config()
+    for path in (config.CONFIG_FILE, config.CONFIG_YAML_FILE):
+        if os.path.exists(path):
+            os.remove(path)
+
+    data = config.load_config()
+    data["system"]["logging"]["level"] = "DEBUG"
+
+    assert config.STATIC_CONFIG_SECTIONS["system"]["logging"]["level"] == "INFO"
+    assert config.load_config()["system"]["logging"]["level"] == "INFO"
@@ -0,0 +1,49 @@
+"""
+项目管理模块测试
+"""
+import os
+
+import project_manager
+from project_manager import ProjectManager, CHAPTER_LOG_FILE, _read_chapter_log
+from novel_generator import Chapter
+
+
+def _make_chapter(num: int) -> Chapter:
+    return Chapter(num=num, title=f"标题{num}", desc="", content=f"第{num}章正文", word_count=5)
+
+
+def test_append_chapter_after_truncated_line(tmp_path, monkeypatch):
+    """日志末尾残留写入中断的半行时，新追加的章节不能丢失"""
+    monkeypatch.setattr(project_manager, "PROJECTS_DIR", str(tmp_path))
+    project_dir = tmp_path / "p1"
+    project_dir.mkdir()
+
+    ok, _ = ProjectManager.append_chapter("p1", _make_chapter(1))
+    assert ok
+
+    # 模拟崩溃：第2章只写入了一半且没有换行符
+    log_file = project_dir / CHAPTER_LOG_FILE
+    with open(log_file, 'ab') as f:
+        f.write('{"num": 2, "title": "标题'.encode('utf-8'))
+
+    ok, _ = ProjectManager.append_chapter("p1", _make_chapter(3))
+    assert ok
+
+    records = _read_chapter_log(str(project_dir))
+    assert sorted(records) == [1, 3]
+    assert records[3]["content"] == "第3章正文"
+
+
+def test_append_chapter_creates_log(tmp_path, monkeypatch):
+    """首次追加时创建日志文件，每条记录一行"""
+    monkeypatch.setattr(project_manager, "PROJECTS_DIR", str(tmp_path))
+    (tmp_path / "p2").mkdir()
+
+    for num in (1, 2):
+        ok, _ = ProjectManager.append_chapter("p2", _make_chapter(num))
+        assert ok
+
+    with open(os.path.join(tmp_path, "p2", CHAPTER_LOG_FILE), 'rb') as f:
+        lines = f.read().split(b"\n")
+    assert lines[-1] == b""
+    assert len(lines) == 3